@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Throughput of the scoring API (reading_aid/api.py) under concurrent clients.
+
+The server runs in-process on uvicorn; its recognizer is a FakeBackend
+that takes RECOGNIZE_SECONDS per call, standing in for a network
+recognizer. Each round sends REQUESTS readings over CLIENTS kept-alive
+connections; extra_info["requests_per_second"] is the throughput.
+"""
+
+import http.client
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import uvicorn
+
+from reading_aid import api
+from reading_aid.recognition import FakeBackend
+
+pytestmark = pytest.mark.benchmark(group="api")
+
+RECOGNIZE_SECONDS = 0.05
+CLIENTS = 16
+REQUESTS = 128
+
+
+@pytest.fixture(scope="module")
+def server(transcripts):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    app = api.create_app(backend=FakeBackend(transcripts, delay=RECOGNIZE_SECONDS))
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                                           access_log=False, timeout_keep_alive=api.KEEP_ALIVE))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield port
+    server.should_exit = True
+    thread.join()
+
+
+def _client(port, requests):
+    """One kept-alive connection sending `requests` (path, body, content type) in turn"""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    try:
+        for path, body, content_type in requests:
+            conn.request("POST", path, body=body, headers={"Content-Type": content_type})
+            response = conn.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+    finally:
+        conn.close()
+
+
+def _burst(port, requests):
+    per_client = [requests[i::CLIENTS] for i in range(CLIENTS)]
+    with ThreadPoolExecutor(CLIENTS) as pool:
+        for future in [pool.submit(_client, port, chunk) for chunk in per_client]:
+            future.result()
+
+
+def _run(benchmark, port, requests):
+    benchmark.pedantic(_burst, args=(port, requests), rounds=5, warmup_rounds=1)
+    if benchmark.stats:  # None with --benchmark-disable
+        benchmark.extra_info["requests_per_second"] = round(len(requests) / benchmark.stats.stats.median, 1)
+
+
+def test_score_audio(benchmark, server, wav_mono_16k, sentences):
+    requests = [(f"/score?sentence_id={i % len(sentences)}", wav_mono_16k, "audio/wav") for i in range(REQUESTS)]
+    _run(benchmark, server, requests)
+
+
+def test_score_transcript(benchmark, server, transcripts):
+    requests = [
+        ("/score", json.dumps({"sentence_id": i % len(transcripts), "transcript": transcripts[i % len(transcripts)]}),
+         "application/json")
+        for i in range(REQUESTS)
+    ]
+    _run(benchmark, server, requests)
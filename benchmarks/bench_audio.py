@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Decoding uploads and preparing audio for recognition."""
+
+import pytest
+
+from reading_aid import fluency
+from reading_aid.ingest import decode_audio
+from reading_aid.preprocess import preprocess
+
+pytestmark = pytest.mark.benchmark(group="audio")
+
+
+@pytest.fixture(params=["wav_mono_16k", "wav_stereo_44k"])
+def recording(request):
+    return request.getfixturevalue(request.param)
+
+
+def test_decode(benchmark, recording):
+    benchmark(decode_audio, recording)
+
+
+def test_preprocess(benchmark, recording):
+    audio = decode_audio(recording)
+    benchmark(preprocess, audio)
+
+
+def test_fluency(benchmark, wav_mono_16k):
+    audio, _ = preprocess(decode_audio(wav_mono_16k))
+    benchmark(fluency.analyse, audio, 8)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""A whole dyslexia.py test (reading_aid/console.py): three sentences read, recognized, scored and summarized.
+
+The microphone plays a pre-recorded reading (sr.AudioFile) and the fake
+backend answers instantly, so this measures the app's own per-sentence
+work, not the network.
+"""
+
+import contextlib
+import io
+
+import pytest
+import speech_recognition as sr
+
+from reading_aid import console
+from reading_aid.recognition import FakeBackend
+
+pytestmark = pytest.mark.benchmark(group="end-to-end")
+
+
+class RecordedMicrophone:
+    """A microphone that plays the same recording for every sentence"""
+
+    def __init__(self, wav):
+        self.wav = wav
+
+    @contextlib.contextmanager
+    def session(self):
+        with sr.AudioFile(io.BytesIO(self.wav)) as source:
+            yield source
+
+
+def test_run_test(benchmark, monkeypatch, wav_mono_16k):
+    monkeypatch.setattr(console, "get_microphone", lambda: RecordedMicrophone(wav_mono_16k))
+    monkeypatch.setattr(console, "get_backend", lambda: FakeBackend(delay=0))
+    monkeypatch.setattr("builtins.input", lambda prompt="": "")
+    monkeypatch.setattr(console, "STREAMING", False)
+    benchmark(console.run_test)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Picking the sentences for a test and getting their scoring index.
+
+The mapped-corpus cases use a synthetic 50k-sentence graded corpus built
+once per run; sampling from it should cost the same as from ten sentences.
+"""
+
+import random
+
+import pytest
+
+from reading_aid.adaptive import DEFAULT_PRIOR, AdaptiveTest, ItemBank, encode
+from reading_aid.corpus import open_corpus, write_corpus
+from reading_aid.scoring import SentenceIndex, get_index
+
+pytestmark = pytest.mark.benchmark(group="sampling")
+
+
+def test_sample_sentences(benchmark, sentences):
+    rng = random.Random(0)
+    benchmark(rng.sample, sentences, 3)
+
+
+def test_get_index_cached(benchmark, sentences):
+    """What every rerun and every recording pays once the index exists"""
+    get_index(sentences)
+    benchmark(get_index, sentences)
+
+
+def test_build_index(benchmark, sentences):
+    benchmark(SentenceIndex, sentences)
+
+
+@pytest.fixture(scope="module")
+def large_corpus(tmp_path_factory, sentences):
+    rng = random.Random(0)
+    words = " ".join(sentences).replace("।", "").split()
+    items = []
+    for i in range(50000):
+        n = rng.randint(3, 15)
+        items.append((" ".join(rng.choice(words) for _ in range(n)) + f" {i}।", 1 + n // 4))
+    path = str(tmp_path_factory.mktemp("corpus") / "corpus.bin")
+    write_corpus(path, items)
+    corpus = open_corpus(path)
+    yield corpus
+    corpus.close()
+
+
+def test_open_corpus(benchmark, large_corpus):
+    benchmark(lambda: open_corpus(large_corpus.path).close())
+
+
+def test_sample_mapped(benchmark, large_corpus):
+    rng = random.Random(0)
+    benchmark(large_corpus.sample, 3, rng=rng)
+
+
+def test_sample_mapped_level_and_length(benchmark, large_corpus):
+    rng = random.Random(0)
+    benchmark(large_corpus.sample, 3, level=2, min_words=5, max_words=7, rng=rng)
+
+
+def test_find_mapped(benchmark, large_corpus):
+    text = large_corpus[31337]
+    benchmark(large_corpus.find, text)
+
+
+def test_adaptive_screening(benchmark, large_corpus):
+    """A whole adaptive test's sentence picks and ability updates, on the 50k corpus"""
+    rng = random.Random(0)
+    bank = ItemBank(encode([rng.gauss(0, 1) for _ in range(len(large_corpus))], large_corpus.fingerprint,
+                           DEFAULT_PRIOR))
+
+    def screening():
+        test = AdaptiveTest(bank, rng)
+        while (sentence_id := test.next_item()) is not None:
+            test.record(sentence_id, rng.randint(40, 100))
+        return test
+
+    benchmark(screening)
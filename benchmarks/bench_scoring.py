@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Accuracy scoring and tokenization on the Hindi corpus (the per-sentence path)."""
+
+import pytest
+from fuzzywuzzy import fuzz
+
+from reading_aid import graphemes
+from reading_aid.alignment import evaluate
+from reading_aid.scoring import SentenceIndex, score_matrix
+
+pytestmark = pytest.mark.benchmark(group="scoring")
+
+
+def test_token_sort_ratio(benchmark, sentences, transcripts):
+    """The original scoring call, one sentence at a time"""
+    pairs = list(zip(sentences, transcripts))
+    benchmark(lambda: [fuzz.token_sort_ratio(ref, hyp) for ref, hyp in pairs])
+
+
+def test_index_score(benchmark, sentences, transcripts):
+    index = SentenceIndex(sentences)
+    pairs = list(zip(sentences, transcripts))
+    benchmark(lambda: [index.score(ref, hyp) for ref, hyp in pairs])
+
+
+def test_score_matrix(benchmark, sentences, transcripts):
+    benchmark(score_matrix, transcripts, sentences, 1)
+
+
+def test_evaluate(benchmark, sentences, transcripts):
+    """WER and CER alignment, shown with every result"""
+    pairs = list(zip(sentences, transcripts))
+    benchmark(lambda: [evaluate(ref, hyp) for ref, hyp in pairs])
+
+
+@pytest.mark.benchmark(group="tokenization")
+def test_aksharas_cold(benchmark, sentences):
+    text = " ".join(sentences)
+    benchmark.pedantic(graphemes.aksharas, args=(text,), setup=graphemes.word_aksharas.cache_clear,
+                       rounds=200)
+
+
+@pytest.mark.benchmark(group="tokenization")
+def test_aksharas_warm(benchmark, sentences):
+    text = " ".join(sentences)
+    graphemes.aksharas(text)
+    benchmark(graphemes.aksharas, text)
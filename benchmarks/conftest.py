@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures for the benchmarks: the corpus, ASR-like transcripts and
+synthetic recordings in the formats the app receives.
+
+Every run is saved to benchmarks/.history as JSON (pytest-benchmark
+autosave). Compare with the previous run and fail on a slowdown:
+
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:15%
+"""
+
+import io
+import os
+import sys
+import wave
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from reading_aid.corpus import SENTENCES  # noqa: E402
+
+
+def wav_bytes(samples, rate, channels=1):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(samples.astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def reading(seconds, rate, channels=1):
+    """Voiced bursts with short gaps and some room noise, like a reader pausing between words"""
+    t = np.arange(int(seconds * rate))
+    voiced = (t % (rate // 2)) > rate // 10
+    rng = np.random.default_rng(0)
+    mono = np.sin(2 * np.pi * 180 * t / rate) * 8000 * voiced + rng.normal(0, 200, t.size)
+    return np.repeat(mono, channels) if channels > 1 else mono
+
+
+@pytest.fixture(scope="session", autouse=True)
+def results_db(tmp_path_factory):
+    """Attempts are still persisted (off the timed path), just not into the real database"""
+    path = tmp_path_factory.mktemp("results") / "results.sqlite3"
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("READING_AID_DB", str(path))
+        yield path
+
+
+@pytest.fixture(scope="session")
+def sentences():
+    return list(SENTENCES)
+
+
+@pytest.fixture(scope="session")
+def transcripts(sentences):
+    """What a recognizer returns: punctuation dropped, a word skipped in every other line"""
+    out = []
+    for i, text in enumerate(sentences):
+        words = text.rstrip("।").split()
+        if i % 2:
+            del words[len(words) // 2]
+        out.append(" ".join(words))
+    return out
+
+
+@pytest.fixture(scope="session")
+def wav_mono_16k():
+    """A browser recording after its own resampling: 4 s, 16 kHz mono"""
+    return wav_bytes(reading(4.0, 16000), 16000)
+
+
+@pytest.fixture(scope="session")
+def wav_stereo_44k():
+    """A raw device recording: 4 s, 44.1 kHz stereo"""
+    return wav_bytes(reading(4.0, 44100, channels=2), 44100, channels=2)
@@ -4,94 +4,60 @@ Offline Dyslexia Reading Test with Final Summary
 Randomly selects Hindi sentences and evaluates pronunciation accuracy.
 Requires:
     pip install SpeechRecognition fuzzywuzzy python-Levenshtein
+The recognition backend is chosen with READING_AID_BACKEND
+(google / vosk / fake), see reading_aid/recognition.py.
+READING_AID_STREAMING=1 transcribes while you are still reading.
+READING_AID_CORPUS=corpus.bin reads from a graded corpus file instead of
+the built-in sentences (python -m reading_aid.corpus build ...).
+READING_AID_ADAPTIVE=1 picks each sentence from your scores so far and
+stops once the result is clear, using difficulties calibrated from past
+results (READING_AID_DIFFICULTY, python -m reading_aid.adaptive calibrate ...).
+Stage timings are logged per sentence with READING_AID_ATTEMPT_LOG=-
+(or a file) and served for Prometheus on READING_AID_METRICS_PORT.
+Every attempt is saved to SQLite (READING_AID_DB, see reading_aid/store.py).
+
+Batch mode scores archived recordings without a microphone:
+    python dyslexia.py --batch manifest.csv --output results.jsonl
+
+This file only parses the command line. The interactive test lives in
+reading_aid/console.py and batch mode in reading_aid/batch.py; each is
+imported once its mode is chosen, so `--help` or a batch run never loads
+the microphone or the speech-recognition stack it does not use.
 """
 
-import random
-import speech_recognition as sr
-from fuzzywuzzy import fuzz
-import statistics
+import argparse
+import os
 
-# ------------------------------------------------------------
-# 1️⃣  Hindi sentences (expand this list as much as you like)
-# ------------------------------------------------------------
-sentences = [
-    "भारत एक विशाल देश है और इसकी संस्कृति विविधता से भरपूर है।",
-    "गंगा नदी भारत की सबसे पवित्र नदियों में से एक मानी जाती है।",
-    "ताजमहल प्रेम का अद्भुत प्रतीक है।",
-    "हिमालय पर्वत श्रृंखला प्राकृतिक सौंदर्य का खजाना है।",
-    "दिल्ली भारत की राजधानी और ऐतिहासिक धरोहरों का केंद्र है।",
-    "सत्य और अहिंसा महात्मा गांधी के मुख्य सिद्धांत थे।",
-    "भारत में विभिन्न भाषाएँ और परंपराएँ एकता में बंधी हैं।",
-    "कड़ी मेहनत और दृढ़ निश्चय सफलता की कुंजी हैं।",
-    "पेड़ हमें स्वच्छ हवा और छाया प्रदान करते हैं।",
-    "पुस्तकें ज्ञान का सबसे बड़ा स्रोत होती हैं।"
-]
-
-LINES_PER_TEST = 3
-chosen_lines = random.sample(sentences, k=LINES_PER_TEST)
-
-recognizer = sr.Recognizer()
-all_scores = []  # store accuracies for final summary
 
 # ------------------------------------------------------------
-# 2️⃣  Test loop
+# Command line: interactive test or batch evaluation
 # ------------------------------------------------------------
-for idx, hindi_text in enumerate(chosen_lines, 1):
-    print(f"\nपंक्ति {idx} में से {LINES_PER_TEST}")
-    print("कृपया निम्नलिखित वाक्य जोर से पढ़ें:\n")
-    print("👉", hindi_text)
-    input("\nपढ़ना शुरू करने के लिए Enter दबाएँ...")
-
-    # ---- record speech ----
-    with sr.Microphone() as source:
-        print("\n🎤 रिकॉर्डिंग हो रही है... बोलें!")
-        recognizer.adjust_for_ambient_noise(source)
-        try:
-            audio = recognizer.listen(source, timeout=10, phrase_time_limit=15)
-        except sr.WaitTimeoutError:
-            print("⚠️ समय समाप्त। अगला वाक्य प्रयास करें।")
-            continue
-        print("रिकॉर्डिंग समाप्त। कृपया प्रतीक्षा करें...")
-
-    # ---- speech to text ----
-    try:
-        user_speech = recognizer.recognize_google(audio, language="hi-IN")
-        print("\n🗣️ आपने कहा:\n", user_speech)
-    except sr.UnknownValueError:
-        print("⚠️ आवाज़ समझ में नहीं आई। अगला वाक्य प्रयास करें।")
-        continue
-    except sr.RequestError:
-        print("⚠️ इंटरनेट कनेक्शन नहीं। कृपया बाद में पुनः प्रयास करें।")
-        continue
-
-    # ---- accuracy ----
-    accuracy = fuzz.token_sort_ratio(hindi_text, user_speech)
-    all_scores.append(accuracy)
-    print(f"\n✅ शुद्धता प्रतिशत: {accuracy}%")
-
-    # ---- per-line suggestion ----
-    if accuracy < 70:
-        print("🔴 सुझाव: पढ़ने में कठिनाई पाई गई। Dyslexia की संभावना है।")
-    elif accuracy < 85:
-        print("🟠 सुझाव: हल्की कठिनाई हो सकती है। जाँच करवाना उचित होगा।")
+def main():
+    parser = argparse.ArgumentParser(description="Hindi reading test (interactive or batch)")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                        help="CSV/JSONL manifest of audio paths and reference sentences")
+    parser.add_argument("--output", metavar="RESULTS",
+                        help="results file, .jsonl or .csv (default: MANIFEST.results.jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--backend", default=None, help="recognition backend (default: READING_AID_BACKEND)")
+    parser.add_argument("--school", default=os.environ.get("READING_AID_SCHOOL"),
+                        help="school recorded with every attempt (default: READING_AID_SCHOOL)")
+    args = parser.parse_args()
+
+    if args.batch:
+        from reading_aid.batch import run_batch
+
+        output = args.output or os.path.splitext(args.batch)[0] + ".results.jsonl"
+        run_batch(args.batch, output, workers=args.workers, backend_name=args.backend)
     else:
-        print("🟢 पढ़ना सही है। Dyslexia की संभावना कम है।")
+        from reading_aid import metrics
+        from reading_aid.console import run_test
 
-# ------------------------------------------------------------
-# 3️⃣  Final summary
-# ------------------------------------------------------------
-print("\n📊 परीक्षण समाप्त। सभी वाक्यों का मूल्यांकन कर लिया गया है।")
+        # Stage timings: JSON lines to READING_AID_ATTEMPT_LOG, /metrics on READING_AID_METRICS_PORT
+        metrics.configure_log(os.environ.get("READING_AID_ATTEMPT_LOG"))
+        metrics.serve_from_env()
+        run_test(args.school)
 
-if all_scores:
-    avg_score = round(statistics.mean(all_scores), 1)
-    print(f"\n🔎 अंतिम औसत शुद्धता: {avg_score}%")
 
-    # Final assessment based on average
-    if avg_score < 70:
-        print("💡 अंतिम निष्कर्ष: पढ़ने में गंभीर कठिनाई। Dyslexia की उच्च संभावना।")
-    elif avg_score < 85:
-        print("💡 अंतिम निष्कर्ष: हल्की कठिनाई देखी गई। आगे परीक्षण करवाना उचित होगा।")
-    else:
-        print("💡 अंतिम निष्कर्ष: पढ़ना सामान्य है। Dyslexia की संभावना कम है।")
-else:
-    print("⚠️ कोई मान्य रिकॉर्डिंग प्राप्त नहीं हुई।")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import streamlit as st
+import os
+import time
+
+from reading_aid import analytics, theme
+
+# ------------------------------------------------------------
+# Operator dashboard: screening results over time
+# ------------------------------------------------------------
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+
+st.set_page_config(
+    page_title="Reading Aid - Analytics",
+    page_icon="📈",
+    layout="wide",
+)
+
+if st.get_option("server.enableStaticServing"):
+    st.html(theme.stylesheet_tag(theme.publish(STATIC_DIR)))
+
+st.title("📈 परिणाम विश्लेषण")
+
+conn = analytics.open_readonly()
+if conn is None:
+    st.info("अभी तक कोई परिणाम सहेजा नहीं गया है।")
+    st.stop()
+
+started = time.perf_counter()
+with conn:
+    overall = analytics.totals(conn)
+    by_sentence = analytics.rollup(conn, "sentence")
+    by_school = analytics.rollup(conn, "school")
+    by_week = analytics.rollup(conn, "week")
+conn.close()
+query_ms = (time.perf_counter() - started) * 1000
+
+col1, col2, col3, col4, col5 = st.columns(5)
+col1.metric("कुल प्रयास", overall["attempts"])
+col2.metric("औसत शुद्धता", f"{overall['average']}%" if overall["average"] is not None else "—")
+for column, (_, band) in zip((col3, col4, col5), analytics.BANDS):
+    share = overall[band]
+    column.metric(f"स्कोर {band}", f"{share}%" if share is not None else "—")
+
+COLUMNS = {
+    "key": None,  # renamed per tab
+    "attempts": "प्रयास",
+    "scored": "स्कोर किए गए",
+    "average": "औसत %",
+    "<70": "<70 (%)",
+    "70-85": "70-85 (%)",
+    "≥85": "≥85 (%)",
+}
+
+
+def show(rows, key_label):
+    if not rows:
+        st.caption("कोई डेटा नहीं।")
+        return
+    labels = dict(COLUMNS, key=key_label)
+    st.dataframe([{labels[k]: v for k, v in row.items()} for row in rows],
+                 hide_index=True, width="stretch")
+
+
+by_week_tab, by_school_tab, by_sentence_tab = st.tabs(["सप्ताह अनुसार", "विद्यालय अनुसार", "वाक्य अनुसार"])
+with by_week_tab:
+    if by_week:
+        st.line_chart(by_week, x="key", y="average", x_label="सप्ताह", y_label="औसत %")
+    show(by_week, "सप्ताह (सोमवार)")
+with by_school_tab:
+    show([dict(row, key=row["key"] or "—") for row in by_school], "विद्यालय")
+with by_sentence_tab:
+    show(sorted(by_sentence, key=lambda row: row["average"] if row["average"] is not None else 101),
+         "वाक्य")
+
+st.caption(f"रोलअप तालिकाओं से {query_ms:.1f} ms में")
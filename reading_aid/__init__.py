@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+Shared engine behind dyslexia.py, streamlit_app.py and the HTTP API.
+
+Both entry points are thin front-ends over this package. Modules that
+only some paths need are imported by those paths: the microphone when
+recording from it, numpy and speech_recognition on the first recording
+or score. `python dyslexia.py --help` loads neither, and the Streamlit
+home page renders before they are (check with `python -X importtime`).
+"""
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+"""
+Adaptive sentence selection (READING_AID_ADAPTIVE=1).
+
+Each sentence has a Rasch difficulty b; a reader has an ability θ, and
+the accuracy they are expected to reach on the sentence is
+
+    accuracy / 100 ≈ 1 / (1 + exp(-(θ - b)))
+
+with accuracy/100 used as a fractional score whose variance is
+DISPERSION·p(1-p). After every reading θ is re-estimated (MAP under a
+normal prior, a few Newton steps) and the next sentence is one the
+reader is expected to read at about TARGET accuracy, drawn at random from
+the NEAREST closest unused ones so readers of the same ability do not all
+see the same sentences. The screening stops once the interval θ ± Z·SE
+lies inside one accuracy band (<70, 70-85, ≥85 on a sentence of typical
+difficulty), after at least MIN_ITEMS and at most MAX_ITEMS recordings.
+Clear cases finish early; the result is that expected accuracy, not the
+raw average of sentences picked to suit the reader.
+
+Difficulties are fitted offline from the results store:
+
+    python -m reading_aid.adaptive calibrate difficulty.bin
+    python -m reading_aid.adaptive simulate [difficulty.bin]
+
+calibrate fits θ per test session and b per sentence jointly (alternating
+Newton steps, mean b anchored at 0), plus the ability prior and the
+dispersion, and writes them sorted by difficulty
+next to a per-id table, memory-mapped like the corpus
+(READING_AID_DIFFICULTY=path). Picking a sentence is a bisect plus a
+short outward walk: O(log n). Sentences without results get the mean
+difficulty of their corpus level. Without a file every sentence starts
+at 0 and only the stopping rule adapts. simulate compares the adaptive
+screening with the fixed LINES_PER_TEST one on simulated readers.
+"""
+
+import argparse
+import array
+import bisect
+import math
+import mmap
+import os
+import random
+import struct
+import threading
+
+from reading_aid.corpus import get_corpus
+from reading_aid.scoring import band
+
+MIN_ITEMS = 2
+MAX_ITEMS = 5
+Z = 0.67  # one-sided 75%; tuned with `simulate`
+NEAREST = 5
+TIE = 0.05  # difficulties this close (about one accuracy point) count as equal
+# Sentences are aimed at this expected accuracy rather than 50% (where a
+# reading tells the most): nearly as informative, and not discouraging
+TARGET = 0.7
+# Before calibration: about 80% on a typical sentence, with a wide spread
+DEFAULT_PRIOR = (1.4, 1.5)
+MIN_PRIOR_SD = 0.5
+FIT_PRIOR_SD = 2.0  # weak prior on theta and b while calibrating
+# Var(accuracy / 100) = DISPERSION * p * (1 - p); fitted by calibrate
+DISPERSION = 0.1
+
+MAGIC = b"RADIFF\x00\x01"
+# magic, item count, corpus fingerprint, prior mean, prior sd, dispersion
+HEADER = struct.Struct("<8sI20sddd")
+
+
+def expected(theta, b):
+    """Expected fractional score of a reader of ability theta on a sentence of difficulty b"""
+    return 1.0 / (1.0 + math.exp(b - theta))
+
+
+# ------------------------------------------------------------
+# Item bank
+# ------------------------------------------------------------
+def encode(difficulties, fingerprint, prior, dispersion=DISPERSION):
+    """File bytes: header, difficulties by id, then (difficulty, id) sorted by difficulty."""
+    order = sorted(range(len(difficulties)), key=lambda i: difficulties[i])
+    parts = [
+        HEADER.pack(MAGIC, len(difficulties), bytes.fromhex(fingerprint), *prior, dispersion),
+        array.array("d", difficulties).tobytes(),
+        array.array("d", [difficulties[i] for i in order]).tobytes(),
+        array.array("I", order).tobytes(),
+    ]
+    return b"".join(parts)
+
+
+class ItemBank:
+    """Sentence difficulties, by id and sorted for nearest-difficulty lookup."""
+
+    def __init__(self, buffer, fingerprint=None):
+        view = memoryview(buffer)
+        magic, count, digest, prior_mean, prior_sd, dispersion = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("not a reading_aid difficulty file")
+        if fingerprint is not None and digest.hex() != fingerprint:
+            raise ValueError("difficulties were calibrated for a different corpus; run calibrate again")
+        self.prior = (prior_mean, prior_sd)
+        self.dispersion = dispersion
+        self._count = count
+        start = HEADER.size
+        self._by_id = view[start:start + 8 * count].cast("d")
+        self._sorted = view[start + 8 * count:start + 16 * count].cast("d")
+        self._ids = view[start + 16 * count:start + 20 * count].cast("I")
+        self.typical = self._sorted[count // 2] if count else 0.0  # the median sentence
+        self.calibrated = True
+
+    @classmethod
+    def uncalibrated(cls, corpus):
+        bank = cls(encode([0.0] * len(corpus), corpus.fingerprint, DEFAULT_PRIOR))
+        bank.calibrated = False
+        return bank
+
+    def __len__(self):
+        return self._count
+
+    def difficulty(self, sentence_id):
+        return self._by_id[sentence_id]
+
+    def nearest(self, theta, exclude=(), k=NEAREST, rng=random):
+        """Up to k unused ids with difficulty closest to theta, in random order.
+
+        Sentences within TIE of the k-th closest count as just as close, and
+        the k are drawn at random from all of them: ties are stored in id
+        order, and walking into them from one end would always serve the
+        same few. Uncalibrated, every sentence is a tie, like corpus.sample().
+        """
+        if self.calibrated:
+            lo = hi = bisect.bisect_left(self._sorted, theta)
+            found, reach = 0, 0.0
+            while found < k and (lo > 0 or hi < self._count):
+                if hi < self._count and (lo == 0 or self._sorted[hi] - theta <= theta - self._sorted[lo - 1]):
+                    candidate, distance = self._ids[hi], self._sorted[hi] - theta
+                    hi += 1
+                else:
+                    lo -= 1
+                    candidate, distance = self._ids[lo], theta - self._sorted[lo]
+                if candidate not in exclude:
+                    found += 1
+                    reach = distance
+            lo = bisect.bisect_left(self._sorted, theta - reach - TIE, 0, lo)
+            hi = bisect.bisect_right(self._sorted, theta + reach + TIE, hi)
+        else:
+            lo, hi = 0, self._count
+        positions = rng.sample(range(lo, hi), min(hi - lo, k + len(exclude)))
+        return [self._ids[p] for p in positions if self._ids[p] not in exclude][:k]
+
+
+def open_item_bank(path, corpus):
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return ItemBank(mapped, corpus.fingerprint)
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_item_bank():
+    """Difficulties for get_corpus(): READING_AID_DIFFICULTY if set, else all zero."""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            corpus = get_corpus()
+            path = os.environ.get("READING_AID_DIFFICULTY")
+            _bank = open_item_bank(path, corpus) if path else ItemBank.uncalibrated(corpus)
+        return _bank
+
+
+# ------------------------------------------------------------
+# One screening
+# ------------------------------------------------------------
+class AdaptiveTest:
+    """Chooses the next sentence from the reader's scores so far and decides when to stop."""
+
+    def __init__(self, bank, rng=random, min_items=MIN_ITEMS, max_items=MAX_ITEMS):
+        self.bank = bank
+        self.rng = rng
+        self.min_items = min_items
+        self.max_items = max_items
+        self.served = []
+        self.responses = []  # (difficulty, fractional score)
+        self.theta, self.se = bank.prior
+
+    def next_item(self):
+        """Id of the next sentence to read, or None once the screening is done."""
+        if self.done:
+            return None
+        aim = self.theta - math.log(TARGET / (1 - TARGET))
+        candidates = self.bank.nearest(aim, exclude=set(self.served), rng=self.rng)
+        if not candidates:
+            return None
+        sentence_id = candidates[0]  # already in random order
+        self.served.append(sentence_id)
+        return sentence_id
+
+    def record(self, sentence_id, accuracy):
+        """Add one scored reading and update the ability estimate."""
+        self.responses.append((self.bank.difficulty(sentence_id), accuracy / 100))
+        mean, sd = self.bank.prior
+        theta = self.theta
+        for _ in range(25):
+            gradient = -(theta - mean) / sd ** 2
+            information = 1 / sd ** 2
+            for b, score in self.responses:
+                p = expected(theta, b)
+                gradient += (score - p) / self.bank.dispersion
+                information += p * (1 - p) / self.bank.dispersion
+            step = gradient / information
+            theta += max(-2.0, min(2.0, step))
+            if abs(step) < 1e-6:
+                break
+        self.theta, self.se = theta, 1 / math.sqrt(information)
+
+    def expected_accuracy(self, theta=None):
+        """Expected accuracy (%) on a sentence of typical difficulty"""
+        return 100 * expected(self.theta if theta is None else theta, self.bank.typical)
+
+    @property
+    def band(self):
+        return band(round(self.expected_accuracy()))
+
+    @property
+    def decided(self):
+        low = band(round(self.expected_accuracy(self.theta - Z * self.se)))
+        high = band(round(self.expected_accuracy(self.theta + Z * self.se)))
+        return low == high
+
+    @property
+    def done(self):
+        if len(self.served) >= self.max_items:
+            return True
+        return len(self.responses) >= self.min_items and self.decided
+
+
+# ------------------------------------------------------------
+# Calibration from stored results
+# ------------------------------------------------------------
+def load_responses(conn, corpus):
+    """(session index, sentence id, fractional score) arrays for every scored reading of a corpus sentence."""
+    import numpy as np
+
+    sessions, items, scores = {}, [], []
+    rows = conn.execute(
+        "SELECT session, sentence, accuracy FROM attempts "
+        "WHERE accuracy IS NOT NULL AND session IS NOT NULL AND outcome = 'ok'"
+    )
+    person = []
+    for session, sentence, accuracy in rows:
+        sentence_id = corpus.find(sentence)
+        if sentence_id is None:
+            continue
+        person.append(sessions.setdefault(session, len(sessions)))
+        items.append(sentence_id)
+        scores.append(accuracy / 100)
+    return np.array(person, dtype=np.int64), np.array(items, dtype=np.int64), np.array(scores)
+
+
+def fit(person, items, scores, n_items, iterations=50, prior_sd=FIT_PRIOR_SD):
+    """Joint MAP estimates (theta per person, b per item) of the fractional Rasch model."""
+    import numpy as np
+
+    n_persons = int(person.max()) + 1 if len(person) else 0
+    theta = np.zeros(n_persons)
+    b = np.zeros(n_items)
+    for _ in range(iterations):
+        p = 1 / (1 + np.exp(b[items] - theta[person]))
+        residual, information = scores - p, p * (1 - p)
+        theta += (np.bincount(person, residual, n_persons) - theta / prior_sd ** 2) / (
+            np.bincount(person, information, n_persons) + 1 / prior_sd ** 2)
+        p = 1 / (1 + np.exp(b[items] - theta[person]))
+        residual, information = scores - p, p * (1 - p)
+        b -= (np.bincount(items, residual, n_items) + b / prior_sd ** 2) / (
+            np.bincount(items, information, n_items) + 1 / prior_sd ** 2)
+        seen = np.bincount(items, minlength=n_items) > 0
+        if seen.any():
+            shift = b[seen].mean()  # anchor: the average calibrated sentence has b = 0
+            b[seen] -= shift
+            theta -= shift
+    return theta, b
+
+
+def calibrate(conn, corpus):
+    """(difficulties by id, prior, dispersion, sentences calibrated, sessions) from the attempts in `conn`"""
+    import numpy as np
+
+    person, items, scores = load_responses(conn, corpus)
+    theta, b = fit(person, items, scores, len(corpus))
+    p = 1 / (1 + np.exp(b[items] - theta[person]))
+    dispersion = DISPERSION
+    if len(scores) > len(theta) + len(np.unique(items)):
+        pearson = ((scores - p) ** 2 / (p * (1 - p))).sum()
+        dispersion = float(pearson / (len(scores) - len(theta) - len(np.unique(items))))
+    seen = np.bincount(items, minlength=len(corpus)) > 0
+    levels = np.array([corpus.level(i) for i in range(len(corpus))])
+    for level in np.unique(levels):
+        at_level = levels == level
+        known = at_level & seen
+        b[at_level & ~seen] = b[known].mean() if known.any() else 0.0
+    if len(theta) >= 2:
+        # a few readings per session shrink each theta towards the mean; add back their posterior variance
+        posterior_variance = 1 / (np.bincount(person, p * (1 - p), len(theta)) / dispersion + 1 / FIT_PRIOR_SD ** 2)
+        sd = math.sqrt(theta.var() + posterior_variance.mean())
+        prior = (float(theta.mean()), max(sd, MIN_PRIOR_SD))
+    else:
+        prior = DEFAULT_PRIOR
+    return b.tolist(), prior, dispersion, int(seen.sum()), len(theta)
+
+
+# ------------------------------------------------------------
+# Simulation
+# ------------------------------------------------------------
+def simulate(bank, corpus, readers=2000, lines=3, seed=0):
+    """Adaptive vs. `lines` random sentences on simulated readers.
+
+    Readers are drawn from the bank's prior; a reading scores a
+    Beta-distributed fraction around its expected value with the bank's
+    dispersion. Returns {mode: (band agreement, mean recordings)},
+    agreement being how often the screening's band matches the band of the
+    reader's true expected accuracy on a typical sentence.
+    """
+    rng = random.Random(seed)
+    mean, sd = bank.prior
+    spread = 1 / bank.dispersion - 1  # Beta(p·c, (1-p)·c) has variance p(1-p) / (c + 1)
+
+    def read(theta, sentence_id):
+        p = min(max(expected(theta, bank.difficulty(sentence_id)), 1e-3), 1 - 1e-3)
+        return 100 * rng.betavariate(p * spread, (1 - p) * spread)
+
+    stats = {"fixed": [0, 0], "adaptive": [0, 0]}
+    for _ in range(readers):
+        theta = rng.gauss(mean, sd)
+        truth = band(round(100 * expected(theta, bank.typical)))
+
+        scores = [read(theta, i) for i in rng.sample(range(len(corpus)), lines)]
+        stats["fixed"][0] += band(round(sum(scores) / len(scores))) == truth
+        stats["fixed"][1] += lines
+
+        test = AdaptiveTest(bank, rng)
+        while (sentence_id := test.next_item()) is not None:
+            test.record(sentence_id, read(theta, sentence_id))
+        stats["adaptive"][0] += test.band == truth
+        stats["adaptive"][1] += len(test.served)
+    return {mode: (hits / readers, items / readers) for mode, (hits, items) in stats.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate or evaluate adaptive sentence selection.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    fit_cmd = commands.add_parser("calibrate", help="fit difficulties from the results store")
+    fit_cmd.add_argument("output")
+    fit_cmd.add_argument("--db", default=None, help="results database (default: READING_AID_DB)")
+    sim_cmd = commands.add_parser("simulate", help="adaptive vs. fixed-length screening on simulated readers")
+    sim_cmd.add_argument("difficulty", nargs="?", help="difficulty file (default: uncalibrated)")
+    sim_cmd.add_argument("--readers", type=int, default=2000)
+    sim_cmd.add_argument("--lines", type=int, default=3, help="fixed test length to compare with")
+    args = parser.parse_args(argv)
+
+    corpus = get_corpus()
+    if args.command == "calibrate":
+        from reading_aid.analytics import open_readonly
+
+        conn = open_readonly(args.db)
+        if conn is None:
+            parser.error("no results database yet")
+        with conn:
+            difficulties, prior, dispersion, calibrated, sessions = calibrate(conn, corpus)
+        conn.close()
+        tmp = args.output + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(encode(difficulties, corpus.fingerprint, prior, dispersion))
+        os.replace(tmp, args.output)
+        print(f"{calibrated}/{len(corpus)} sentences calibrated from {sessions} sessions; "
+              f"ability prior {prior[0]:.2f} ± {prior[1]:.2f}, dispersion {dispersion:.3f} -> {args.output}")
+    else:
+        bank = open_item_bank(args.difficulty, corpus) if args.difficulty else ItemBank.uncalibrated(corpus)
+        for mode, (agreement, recordings) in simulate(bank, corpus, args.readers, args.lines).items():
+            print(f"{mode:9s} band agreement {agreement:6.1%}   recordings per screening {recordings:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Word and character error rates with a full word alignment.
+
+Both sides are normalized the same way as the sentence index (NFC,
+no danda/punctuation, nukta folded). Distances come from rapidfuzz's
+Levenshtein, which runs the bit-parallel Myers/Hyyrö algorithm in C and
+accepts token sequences as well as strings, so a word list or a list of
+aksara clusters (reading_aid/graphemes.py) is compared with one call.
+
+    >>> result = evaluate("ताजमहल प्रेम का अद्भुत प्रतीक है।", "ताजमहल प्रेम का प्रतीक है")
+    >>> result.wer, [op for op in result.ops if op.kind != "equal"]
+    (0.167, [Op(kind='delete', ref='अद्भुत', hyp=None)])
+"""
+
+from collections import namedtuple
+
+from rapidfuzz.distance import Levenshtein
+
+from reading_aid.graphemes import aksharas
+from reading_aid.scoring import normalize
+
+Op = namedtuple("Op", "kind ref hyp")  # kind: equal / substitute / insert / delete
+AlignmentResult = namedtuple("AlignmentResult", "wer cer word_errors char_errors ops")
+
+
+def align(ref_tokens, hyp_tokens):
+    """Token-level alignment as a list of Op, in reference order."""
+    ops = []
+    for tag, i1, i2, j1, j2 in Levenshtein.opcodes(ref_tokens, hyp_tokens):
+        if tag == "equal":
+            ops.extend(Op("equal", r, h) for r, h in zip(ref_tokens[i1:i2], hyp_tokens[j1:j2]))
+        elif tag == "replace":
+            ops.extend(Op("substitute", r, h) for r, h in zip(ref_tokens[i1:i2], hyp_tokens[j1:j2]))
+        elif tag == "delete":
+            ops.extend(Op("delete", r, None) for r in ref_tokens[i1:i2])
+        else:
+            ops.extend(Op("insert", None, h) for h in hyp_tokens[j1:j2])
+    return ops
+
+
+def error_rate(ref_tokens, hyp_tokens):
+    """(edit distance, rate) of hyp against ref; the rate is relative to len(ref)."""
+    errors = Levenshtein.distance(ref_tokens, hyp_tokens)
+    return errors, round(errors / max(len(ref_tokens), 1), 3)
+
+
+def _words(text):
+    """Normalized words, plus the original spelling of each for display."""
+    normalized, original = [], []
+    for word in text.split():
+        parts = normalize(word).split()
+        normalized.extend(parts)
+        original.extend([word.strip("।॥.,!?") or word] * len(parts))
+    return normalized, original
+
+
+def evaluate(reference, transcript):
+    """WER, CER (over aksara clusters) and word alignment of a transcript.
+
+    Words are compared in normalized form; the Ops carry the words as
+    they were written, so they can be shown to the reader.
+    """
+    ref_words, ref_shown = _words(reference)
+    hyp_words, hyp_shown = _words(transcript or "")
+    word_errors, wer = error_rate(ref_words, hyp_words)
+    char_errors, cer = error_rate(aksharas(" ".join(ref_words)), aksharas(" ".join(hyp_words)))
+    ops = []
+    i = j = 0
+    for op in align(ref_words, hyp_words):
+        ref_word = hyp_word = None
+        if op.ref is not None:
+            ref_word, i = ref_shown[i], i + 1
+        if op.hyp is not None:
+            hyp_word, j = hyp_shown[j], j + 1
+        ops.append(Op(op.kind, ref_word, hyp_word))
+    return AlignmentResult(wer, cer, word_errors, char_errors, ops)
+
+
+def missed_words(result):
+    """Reference words the reader skipped or misread."""
+    return [op.ref for op in result.ops if op.kind in ("substitute", "delete")]
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Dashboard queries over the results store's rollup tables.
+
+Every query reads rollup_sentence / rollup_school / rollup_week, which
+hold one row per sentence, school or week however many attempts there
+are (see reading_aid/store.py), so they take milliseconds. The
+database is opened read-only; WAL lets it be read while the app writes.
+"""
+
+import os
+import sqlite3
+
+from reading_aid.store import ROLLUPS, db_path
+
+BANDS = (("band_low", "<70"), ("band_mid", "70-85"), ("band_high", "≥85"))
+
+
+def open_readonly(path=None):
+    """Read-only connection to the results database, or None if it does not exist yet."""
+    path = path or db_path()
+    if not os.path.exists(path):
+        return None
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5)
+
+
+def _row(key, attempts, scored, accuracy_sum, *bands):
+    row = {
+        "key": key,
+        "attempts": attempts,
+        "scored": scored,
+        "average": round(accuracy_sum / scored, 1) if scored else None,
+    }
+    for (_, label), count in zip(BANDS, bands):
+        row[label] = round(100 * count / scored, 1) if scored else None  # share of scored attempts, %
+    return row
+
+
+def rollup(conn, name):
+    """Rows of one rollup ("sentence", "school" or "week"), ordered by key."""
+    if name not in ROLLUPS:
+        raise ValueError(f"Unknown rollup {name!r}, choose from {sorted(ROLLUPS)}")
+    cursor = conn.execute(
+        f"SELECT key, attempts, scored, accuracy_sum, band_low, band_mid, band_high "
+        f"FROM rollup_{name} ORDER BY key"
+    )
+    return [_row(*values) for values in cursor]
+
+
+def totals(conn):
+    """All attempts together; summed over the (small) weekly rollup."""
+    values = conn.execute(
+        "SELECT TOTAL(attempts), TOTAL(scored), TOTAL(accuracy_sum), "
+        "TOTAL(band_low), TOTAL(band_mid), TOTAL(band_high) FROM rollup_week"
+    ).fetchone()
+    return _row("all", *(int(v) for v in values))
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Headless scoring API: the app's recognizer and scorer over HTTP.
+
+    python -m reading_aid.api [--host 127.0.0.1] [--port 8600]
+
+Endpoints:
+    POST /score      JSON {"sentence_id": 3, "transcript": "..."} scores a
+                     transcript. Any other body is a recording (WAV, WebM or
+                     Ogg) for ?sentence_id=3; it is decoded, preprocessed and
+                     recognized first. "school" / "session" (string JSON field or
+                     query parameter) are stored with the attempt.
+                     -> {"sentence_id", "sentence", "transcript", "accuracy",
+                         "band", "wer", "cer", "missed", "fluency"}
+    GET /sentences   the corpus with ids, levels and word counts; optional
+                     ?level= &min_words= &max_words= filters, paged with
+                     ?offset= &limit= (at most MAX_PAGE)
+    GET /health      {"status": "ok", "backend": ..., "in_flight": ...}
+    GET /metrics     stage histograms (reading_aid/metrics.py), flow "api"
+
+Scoring goes through reading_aid/engine.py with the backend from
+READING_AID_BACKEND, the same as the Streamlit app, and every request is
+saved to the results store. The blocking work runs on the shared job pool
+(reading_aid/jobs.py), so the event loop only moves bytes.
+
+Limits: at most --max-concurrency requests score at once (default
+READING_AID_WORKERS); the rest wait up to --queue-seconds for a slot and
+then get 503 with Retry-After. uvicorn holds at most --max-connections
+connections and keeps idle ones open for --keep-alive seconds, so
+clients that reuse a connection skip the TCP handshake on every reading.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from reading_aid import metrics
+from reading_aid.corpus import MappedCorpus, get_corpus
+from reading_aid.engine import recognize_and_score, score_transcript
+from reading_aid.ingest import decode_audio
+from reading_aid.jobs import MAX_WORKERS, get_executor
+from reading_aid.recognition import get_backend
+from reading_aid.scoring import band, get_index
+from reading_aid.store import get_store
+
+DEFAULT_PORT = 8600
+QUEUE_SECONDS = 5.0
+MAX_CONNECTIONS = 512
+KEEP_ALIVE = 30
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_PAGE = 1000
+# outcome -> HTTP status, for attempts that did not produce a score
+ERROR_STATUS = {"unintelligible": 422, "decode_error": 422, "request_error": 502}
+
+
+class BadRequest(Exception):
+    def __init__(self, status, error, detail):
+        super().__init__(detail)
+        self.status = status
+        self.error = error
+        self.detail = detail
+
+
+def _error(status, error, detail=None, headers=None):
+    body = {"error": error}
+    if detail:
+        body["detail"] = detail
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+# ------------------------------------------------------------
+# Request parsing
+# ------------------------------------------------------------
+async def _read_body(request):
+    length = request.headers.get("content-length")
+    if length is not None:
+        if not (length.isascii() and length.strip().isdigit()):
+            raise BadRequest(400, "bad_request", "invalid Content-Length")
+        if int(length) > MAX_BODY_BYTES:
+            raise BadRequest(413, "too_large", f"body over {MAX_BODY_BYTES} bytes")
+    body = await request.body()
+    if len(body) > MAX_BODY_BYTES:
+        raise BadRequest(413, "too_large", f"body over {MAX_BODY_BYTES} bytes")
+    if not body:
+        raise BadRequest(400, "bad_request", "empty body")
+    return body
+
+
+def _sentence_id(value, index, from_query):
+    """A JSON integer, or digits in the query string; not 1.7, "1" or true in JSON"""
+    if from_query and value.isascii() and value.isdigit():
+        sentence_id = int(value)
+    elif not from_query and isinstance(value, int) and not isinstance(value, bool):
+        sentence_id = value
+    else:
+        raise BadRequest(400, "bad_request", "sentence_id must be an integer")
+    if not 0 <= sentence_id < len(index):
+        raise BadRequest(404, "unknown_sentence", f"sentence_id must be in 0..{len(index) - 1}")
+    return sentence_id
+
+
+async def _parse(request, index):
+    """(sentence_id, transcript or None, audio bytes or None, session, school)"""
+    body = await _read_body(request)
+    fields = dict(request.query_params)
+    from_query = True
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "application/json":
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise BadRequest(400, "bad_request", "invalid JSON")
+        if not isinstance(payload, dict) or not isinstance(payload.get("transcript"), str):
+            raise BadRequest(400, "bad_request", 'JSON body needs "sentence_id" and "transcript"')
+        fields.update(payload)
+        from_query = "sentence_id" not in payload
+        transcript, audio = payload["transcript"], None
+    else:
+        transcript, audio = None, body
+    if fields.get("sentence_id") is None:
+        raise BadRequest(400, "bad_request", "sentence_id is required")
+    for name in ("session", "school"):
+        if not isinstance(fields.get(name), (str, type(None))):
+            raise BadRequest(400, "bad_request", f"{name} must be a string")
+    return (_sentence_id(fields["sentence_id"], index, from_query), transcript, audio,
+            fields.get("session"), fields.get("school"))
+
+
+# ------------------------------------------------------------
+# Scoring
+# ------------------------------------------------------------
+def _score_blocking(attempt, backend, index, hindi_text, transcript, audio):
+    if audio is None:
+        return score_transcript(attempt, index, hindi_text, transcript)
+    with attempt.span("decode"):
+        recording = decode_audio(audio)
+    return recognize_and_score(attempt, backend, index, hindi_text, recording)
+
+
+async def score(request):
+    state = request.app.state
+    try:
+        sentence_id, transcript, audio, session, school = await _parse(request, state.index)
+    except BadRequest as e:
+        return _error(e.status, e.error, e.detail)
+
+    attempt = metrics.Attempt("api")
+    queued = time.perf_counter()
+    try:
+        await asyncio.wait_for(state.slots.acquire(), state.queue_seconds)
+    except asyncio.TimeoutError:
+        attempt.add("queue", time.perf_counter() - queued)
+        attempt.finish("busy")  # not stored: nothing was read or scored
+        return _error(503, "busy", "all scoring slots are taken", headers={"Retry-After": "1"})
+    attempt.add("queue", time.perf_counter() - queued)
+    state.in_flight += 1
+
+    hindi_text = state.index.entry(sentence_id).text
+    result = None
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            get_executor(), _score_blocking, attempt, state.backend, state.index, hindi_text, transcript, audio
+        )
+    except Exception as e:
+        attempt.fail(e)
+        status = ERROR_STATUS.get(attempt.outcome, 500)
+        return _error(status, attempt.outcome, str(e) or None)
+    finally:
+        state.in_flight -= 1
+        state.slots.release()
+        attempt.finish()
+        if state.store is not None:
+            state.store.add(attempt, hindi_text, result, sentence_id, session, school)
+
+    return JSONResponse({
+        "sentence_id": sentence_id,
+        "sentence": hindi_text,
+        "transcript": result["transcript"],
+        "accuracy": result["accuracy"],
+        "band": band(result["accuracy"]),
+        "wer": result["wer"],
+        "cer": result["cer"],
+        "missed": result["missed"],
+        "fluency": result["fluency"],
+    })
+
+
+def _int_param(request, name, default=None):
+    value = request.query_params.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequest(400, "bad_request", f"{name} must be an integer")
+
+
+async def list_sentences(request):
+    corpus = request.app.state.corpus
+    try:
+        ids = corpus.ids(_int_param(request, "level"), _int_param(request, "min_words"),
+                         _int_param(request, "max_words"))
+        offset = max(_int_param(request, "offset", 0), 0)
+        limit = min(max(_int_param(request, "limit", 100), 0), MAX_PAGE)
+    except BadRequest as e:
+        return _error(e.status, e.error, e.detail)
+    return JSONResponse({
+        "total": len(ids),
+        "sentences": [
+            {"id": i, "text": corpus[i], "level": corpus.level(i), "words": corpus.words(i)}
+            for i in ids[offset:offset + limit]
+        ],
+    })
+
+
+async def health(request):
+    state = request.app.state
+    return JSONResponse({
+        "status": "ok",
+        "backend": state.backend.name,
+        "in_flight": state.in_flight,
+    })
+
+
+async def export_metrics(request):
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+# ------------------------------------------------------------
+# App
+# ------------------------------------------------------------
+def create_app(backend=None, sentences=None, max_concurrency=MAX_WORKERS,
+               queue_seconds=QUEUE_SECONDS, store=None):
+    """The ASGI app; the backend defaults to READING_AID_BACKEND, the sentences
+    to get_corpus() and the store to get_store()."""
+    app = Starlette(routes=[
+        Route("/score", score, methods=["POST"]),
+        Route("/sentences", list_sentences),
+        Route("/health", health),
+        Route("/metrics", export_metrics),
+    ])
+    app.state.backend = backend if backend is not None else get_backend()
+    if sentences is None:
+        sentences = get_corpus()
+    elif not isinstance(sentences, MappedCorpus):
+        sentences = MappedCorpus.from_sentences(sentences)
+    app.state.corpus = sentences
+    app.state.index = get_index(sentences)
+    app.state.store = store if store is not None else get_store()
+    app.state.in_flight = 0
+    app.state.queue_seconds = queue_seconds
+    app.state.slots = asyncio.Semaphore(max_concurrency)
+    get_executor()
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve reading scores over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-concurrency", type=int, default=MAX_WORKERS,
+                        help="readings scored at once (default: READING_AID_WORKERS)")
+    parser.add_argument("--queue-seconds", type=float, default=QUEUE_SECONDS,
+                        help="how long a request may wait for a slot before 503")
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS)
+    parser.add_argument("--keep-alive", type=int, default=KEEP_ALIVE,
+                        help="seconds an idle connection is kept open")
+    args = parser.parse_args(argv)
+
+    metrics.configure_log(os.environ.get("READING_AID_ATTEMPT_LOG"))
+    app = create_app(max_concurrency=args.max_concurrency, queue_seconds=args.queue_seconds)
+    uvicorn.run(app, host=args.host, port=args.port, timeout_keep_alive=args.keep_alive,
+                limit_concurrency=args.max_connections, access_log=False)
+
+
+if __name__ == "__main__":
+    main()
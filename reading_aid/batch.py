@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Offline batch evaluation of archived recordings.
+
+Manifest: CSV with `audio` and `reference` columns (optionally `id`), or
+JSONL objects with the same keys. Relative audio paths are resolved
+against the manifest's directory; WAV, WebM and Ogg are accepted.
+
+Recordings are decoded, preprocessed, recognized and scored on a process
+pool. Each result is appended to the output (.jsonl or .csv) and flushed
+as soon as it finishes. Rerunning with the same output resumes: rows that
+are already there are skipped, except request errors, which are retried,
+and a last row cut short by a crash is dropped and redone.
+"""
+
+import concurrent.futures
+import csv
+import json
+import os
+import time
+
+import speech_recognition as sr
+
+from reading_aid.alignment import evaluate, missed_words
+from reading_aid.ingest import AudioDecodeError, decode_audio
+from reading_aid.preprocess import preprocess
+from reading_aid.recognition import get_backend
+from reading_aid.scoring import SentenceIndex
+
+FIELDS = ["id", "audio", "reference", "transcript", "accuracy", "wer", "cer", "missed", "error", "seconds"]
+IN_FLIGHT_PER_WORKER = 4
+
+
+def read_manifest(path):
+    """List of {id, audio, reference} dicts; `id` defaults to the audio path."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    items = []
+    for row in rows:
+        audio = row["audio"]
+        items.append({
+            "id": row.get("id") or audio,
+            "audio": audio if os.path.isabs(audio) else os.path.join(base, audio),
+            "reference": row["reference"],
+        })
+    return items
+
+
+def drop_torn_line(output):
+    """Cut a line left unfinished by a crash off the end of `output`, so
+    appended rows start on a line of their own and the torn row is redone."""
+    if not os.path.exists(output):
+        return
+    with open(output, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(pos - 4096, 0)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos != end:
+            f.truncate(pos)
+
+
+def completed_ids(output):
+    """Ids already in the output, skipping torn lines and retryable request errors."""
+    if not os.path.exists(output):
+        return set()
+    done = set()
+    with open(output, encoding="utf-8", newline="") as f:
+        if output.endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = []
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # last line cut short by a crash
+        for row in rows:
+            finished = row.get("seconds") not in (None, "")
+            if row.get("id") and finished and not (row.get("error") or "").startswith("request"):
+                done.add(row["id"])
+    return done
+
+
+class _ResultWriter:
+    def __init__(self, path):
+        self.csv = path.endswith(".csv")
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._f = open(path, "a", encoding="utf-8", newline="")
+        if self.csv:
+            self._writer = csv.DictWriter(self._f, fieldnames=FIELDS)
+            if new:
+                self._writer.writeheader()
+
+    def write(self, row):
+        if self.csv:
+            self._writer.writerow(dict(row, missed=" ".join(row["missed"] or [])))
+        else:
+            self._f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+# ------------------------------------------------------------
+# Worker side
+# ------------------------------------------------------------
+_backend = None
+_index = None
+
+
+def _init_worker(backend_name):
+    global _backend, _index
+    _backend = get_backend(backend_name)
+    _index = SentenceIndex([])  # references are indexed on first use
+
+
+def evaluate_recording(item):
+    """Recognize and score one manifest item; errors are reported in the row."""
+    started = time.perf_counter()
+    row = dict(item, transcript=None, accuracy=None, wer=None, cer=None, missed=None, error=None)
+    try:
+        with open(item["audio"], "rb") as f:
+            audio = decode_audio(f.read())
+        audio, _ = preprocess(audio)
+        transcript = _backend.recognize(audio)
+        alignment = evaluate(item["reference"], transcript)
+        row.update(
+            transcript=transcript,
+            accuracy=_index.score(item["reference"], transcript),
+            wer=alignment.wer,
+            cer=alignment.cer,
+            missed=missed_words(alignment),
+        )
+    except sr.UnknownValueError:
+        row["error"] = "unknown_value"
+    except sr.RequestError as e:
+        row["error"] = f"request: {e}"
+    except (OSError, AudioDecodeError) as e:
+        row["error"] = f"audio: {e}"
+    except Exception as e:  # one bad recording must not abort the run (or every rerun)
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["seconds"] = round(time.perf_counter() - started, 3)
+    return row
+
+
+# ------------------------------------------------------------
+# Driver
+# ------------------------------------------------------------
+def run_batch(manifest, output, workers=None, backend_name=None, progress=print):
+    """Evaluate every pending manifest item on a process pool, streaming rows to `output`."""
+    items = read_manifest(manifest)
+    drop_torn_line(output)
+    done = completed_ids(output)
+    pending = iter([item for item in items if item["id"] not in done])
+    progress(f"{len(items)} recordings, {len(done)} already done, writing to {output}")
+
+    workers = workers or os.cpu_count() or 1
+    writer = _ResultWriter(output)
+    outcomes = []  # True per clean row, False per row with an error
+    started = time.perf_counter()
+
+    def collect(futures):
+        for future in futures:
+            row = future.result()
+            writer.write(row)
+            outcomes.append(row["error"] is None)
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(backend_name,)
+        ) as pool:
+            # Keep a bounded window in flight instead of queueing the whole manifest
+            in_flight = set()
+            for item in pending:
+                in_flight.add(pool.submit(evaluate_recording, item))
+                if len(in_flight) >= workers * IN_FLIGHT_PER_WORKER:
+                    completed, in_flight = concurrent.futures.wait(
+                        in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                    collect(completed)
+            collect(concurrent.futures.as_completed(in_flight))
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    rate = f", {len(outcomes) / elapsed:.1f} recordings/s" if outcomes and elapsed else ""
+    progress(f"{len(outcomes)} evaluated ({outcomes.count(False)} with errors) in {elapsed:.1f}s{rate}")
+    return len(outcomes)
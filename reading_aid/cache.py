@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache for recognition results.
+
+The key is a SHA-256 of the audio as 16 kHz / 16-bit PCM plus the language
+and backend name, so a retry, a Streamlit rerun or a reprocessing job that
+sends the same audio again is answered without calling the recognizer.
+
+Two tiers:
+    memory  LRU of the most recent results, per process
+    disk    one small file per result under READING_AID_CACHE_DIR,
+            oldest files evicted once the directory grows past
+            READING_AID_CACHE_MAX_BYTES
+
+Unintelligible audio (sr.UnknownValueError) is cached too; request errors
+are not, since they say nothing about the audio.
+"""
+
+import collections
+import hashlib
+import os
+import tempfile
+import threading
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "reading_aid", "recognition")
+KEY_RATE = 16000
+KEY_WIDTH = 2
+UNKNOWN = ""  # stored for unintelligible audio; real transcripts are never empty
+
+
+class RecognitionCache:
+    """Two-tier (memory LRU + disk) store of transcripts keyed by audio hash."""
+
+    def __init__(self, directory=None, memory_items=512, max_disk_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.memory_items = memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._disk_bytes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(e.stat().st_size for e in os.scandir(directory) if e.is_file())
+
+    @staticmethod
+    def key(audio, language, backend_name):
+        digest = hashlib.sha256(audio.get_raw_data(convert_rate=KEY_RATE, convert_width=KEY_WIDTH))
+        digest.update(f"\0{language}\0{backend_name}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached transcript ("" for unintelligible audio) or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+        text = self._read_disk(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key, text):
+        with self._lock:
+            self._remember(key, text)
+        if self.directory:
+            self._write_disk(key, text)
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+                "evictions": self.evictions,
+            }
+
+    # ---- internals ----
+    def _remember(self, key, text):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # keeps eviction least-recently-used
+        except OSError:
+            pass
+        return text
+
+    def _write_disk(self, key, text):
+        data = text.encode("utf-8")
+        # Write-then-rename so other processes never see a half-written file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        path = self._path(key)
+        try:
+            replaced = os.stat(path).st_size  # another worker may have cached the same audio
+        except OSError:
+            replaced = 0
+        os.replace(tmp, path)
+        with self._lock:
+            self._disk_bytes += len(data) - replaced
+            over = self._disk_bytes > self.max_disk_bytes
+        if over:
+            self._evict()
+
+    def _evict(self):
+        """Drop the least recently used files until the directory is at 90% of its budget."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith(".tmp-"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 0.9
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._disk_bytes = total
+            self.evictions += removed
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache configured from READING_AID_CACHE_DIR / READING_AID_CACHE_MAX_BYTES."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = RecognitionCache(
+                directory=os.environ.get("READING_AID_CACHE_DIR", DEFAULT_DIR) or None,
+                max_disk_bytes=int(os.environ.get("READING_AID_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            )
+        return _shared_cache
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+The interactive reading test in a terminal, behind `python dyslexia.py`.
+
+Sentences are read aloud into the local microphone one at a time; each
+one is recognized and scored right away and the summary is printed at
+the end. READING_AID_STREAMING=1 transcribes while the reader is still
+reading; READING_AID_ADAPTIVE=1 picks each next sentence from the scores
+so far and stops once the result is clear (reading_aid/adaptive.py).
+"""
+
+import os
+import statistics
+import uuid
+
+import speech_recognition as sr
+
+from reading_aid import fluency, metrics
+from reading_aid.alignment import evaluate, missed_words
+from reading_aid.corpus import get_corpus
+from reading_aid.microphone import NoiseFloor, get_microphone
+from reading_aid.preprocess import preprocess
+from reading_aid.recognition import get_backend
+from reading_aid.scoring import get_index
+from reading_aid.store import get_store
+from reading_aid.streaming import finish_stream, listen_streaming, open_stream
+
+LINES_PER_TEST = 3
+STREAMING = os.environ.get("READING_AID_STREAMING") == "1"
+ADAPTIVE = os.environ.get("READING_AID_ADAPTIVE") == "1"
+
+
+# ------------------------------------------------------------
+# Interactive test
+# ------------------------------------------------------------
+def run_test(school=None):
+    """Read LINES_PER_TEST random sentences (or an adaptive test) aloud and print the summary."""
+    sentences = get_corpus()  # built-in, or the graded corpus in READING_AID_CORPUS
+    if ADAPTIVE:
+        from reading_aid.adaptive import AdaptiveTest, get_item_bank
+        test = AdaptiveTest(get_item_bank())
+        total = test.max_items  # at most; a clear result ends the test sooner
+        # the next sentence is only chosen once the previous one is scored
+        chosen_lines = (sentences[sentence_id] for sentence_id in iter(test.next_item, None))
+    else:
+        test = None
+        total = LINES_PER_TEST
+        chosen_lines = sentences.sample(LINES_PER_TEST)
+
+    recognizer = sr.Recognizer()
+    microphone = get_microphone()  # opened once, reused for every sentence
+    noise_floor = NoiseFloor()     # calibrated before the first sentence only
+    backend = get_backend()
+    index = get_index(sentences)
+    all_scores = []  # store accuracies for final summary
+    all_fluency = []  # reading speed / pauses per sentence
+    results = get_store()  # every attempt is kept, in SQLite
+    session = uuid.uuid4().hex
+
+    def finish(attempt, hindi_text, result=None, outcome=None):
+        attempt.finish(outcome)
+        if results is not None:
+            results.add(attempt, hindi_text, result, index.entry(hindi_text).id, session, school)
+
+    # ---- test loop ----
+    for idx, hindi_text in enumerate(chosen_lines, 1):
+        print(f"\nपंक्ति {idx} में से {total}")
+        print("कृपया निम्नलिखित वाक्य जोर से पढ़ें:\n")
+        print("👉", hindi_text)
+        input("\nपढ़ना शुरू करने के लिए Enter दबाएँ...")
+
+        # ---- record speech ----
+        attempt = metrics.Attempt("cli")  # per-stage timings of this sentence
+        with microphone.session() as source:
+            print("\n🎤 रिकॉर्डिंग हो रही है... बोलें!")
+            with attempt.span("calibrate"):
+                noise_floor.apply(recognizer, source)
+            try:
+                with attempt.span("listen"):
+                    if STREAMING:
+                        # partial transcript and running score, updated while you read
+                        stream = open_stream(backend, on_partial=lambda text, ref=hindi_text: print(
+                            f"\r   … {text} ({index.score(ref, text)}%)", end="", flush=True))
+                        audio = listen_streaming(recognizer, source, stream, timeout=10, phrase_time_limit=15)
+                        print()
+                    else:
+                        audio = recognizer.listen(source, timeout=10, phrase_time_limit=15)
+            except sr.WaitTimeoutError as e:
+                print("⚠️ समय समाप्त। अगला वाक्य प्रयास करें।")
+                finish(attempt, hindi_text, outcome=metrics.outcome_of(e))
+                continue
+            print("रिकॉर्डिंग समाप्त। कृपया प्रतीक्षा करें...")
+        noise_floor.observe(audio, microphone, recognizer)
+
+        # ---- speech to text ----
+        try:
+            if STREAMING:
+                with attempt.span("recognize"):
+                    user_speech = finish_stream(stream)
+            else:
+                with attempt.span("preprocess"):
+                    audio, _ = preprocess(audio)  # trimmed 16 kHz mono: less to upload and decode
+                with attempt.span("recognize"):
+                    user_speech = backend.recognize(audio)
+            print("\n🗣️ आपने कहा:\n", user_speech)
+        except sr.UnknownValueError as e:
+            print("⚠️ आवाज़ समझ में नहीं आई। अगला वाक्य प्रयास करें।")
+            finish(attempt, hindi_text, outcome=metrics.outcome_of(e))
+            continue
+        except sr.RequestError as e:
+            print("⚠️ इंटरनेट कनेक्शन नहीं। कृपया बाद में पुनः प्रयास करें।")
+            finish(attempt, hindi_text, outcome=metrics.outcome_of(e))
+            continue
+
+        # ---- accuracy, word / character errors, fluency ----
+        with attempt.span("score"):
+            accuracy = index.score(hindi_text, user_speech)
+            alignment = evaluate(hindi_text, user_speech)
+            missed = missed_words(alignment)
+            reading = fluency.analyse(audio, len(hindi_text.split()))._asdict()
+        all_scores.append(accuracy)
+        all_fluency.append(reading)
+        if test is not None:
+            test.record(test.served[-1], accuracy)
+
+        with attempt.span("render"):
+            print(f"\n✅ शुद्धता प्रतिशत: {accuracy}%")
+            print(f"📝 शब्द त्रुटि दर (WER): {alignment.wer:.0%} | अक्षर त्रुटि दर (CER): {alignment.cer:.0%}")
+            if missed:
+                print("   छूटे / गलत पढ़े शब्द:", ", ".join(missed))
+
+            # ---- per-line suggestion ----
+            if accuracy < 70:
+                print("🔴 सुझाव: पढ़ने में कठिनाई पाई गई। Dyslexia की संभावना है।")
+            elif accuracy < 85:
+                print("🟠 सुझाव: हल्की कठिनाई हो सकती है। जाँच करवाना उचित होगा।")
+            else:
+                print("🟢 पढ़ना सही है। Dyslexia की संभावना कम है।")
+        finish(attempt, hindi_text, {
+            "transcript": user_speech, "accuracy": accuracy, "wer": alignment.wer,
+            "cer": alignment.cer, "missed": missed, "fluency": reading,
+        })
+
+    # ---- final summary ----
+    print("\n📊 परीक्षण समाप्त। सभी वाक्यों का मूल्यांकन कर लिया गया है।")
+
+    if all_scores:
+        if test is not None:
+            # adaptive sentences suit the reader: report the expected accuracy on a typical one
+            avg_score = round(test.expected_accuracy(), 1)
+            print(f"\n🔎 अनुमानित शुद्धता: {avg_score}%")
+        else:
+            avg_score = round(statistics.mean(all_scores), 1)
+            print(f"\n🔎 अंतिम औसत शुद्धता: {avg_score}%")
+
+        fluency_summary = fluency.summarize(all_fluency)
+        if fluency_summary:
+            print(f"⏱️ पढ़ने की गति: {fluency_summary['words_per_minute']} शब्द प्रति मिनट"
+                  f" | विराम: {fluency_summary['pauses']} ({fluency_summary['pause_seconds']} सेकंड)"
+                  f" | लंबी झिझक: {fluency_summary['hesitations']}")
+
+        # Final assessment based on average
+        if avg_score < 70:
+            print("💡 अंतिम निष्कर्ष: पढ़ने में गंभीर कठिनाई। Dyslexia की उच्च संभावना।")
+        elif avg_score < 85:
+            print("💡 अंतिम निष्कर्ष: हल्की कठिनाई देखी गई। आगे परीक्षण करवाना उचित होगा।")
+        else:
+            print("💡 अंतिम निष्कर्ष: पढ़ना सामान्य है। Dyslexia की संभावना कम है।")
+    else:
+        print("⚠️ कोई मान्य रिकॉर्डिंग प्राप्त नहीं हुई।")
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+The Hindi sentences the front-ends read from.
+
+SENTENCES is the small built-in set. A graded corpus of any size is
+built once into a single file and memory-mapped by every process that
+reads it (READING_AID_CORPUS=path):
+
+    python -m reading_aid.corpus build sentences.csv corpus.bin
+    python -m reading_aid.corpus info corpus.bin
+
+The input is CSV or JSONL with a `text` column and an optional `level`
+(difficulty, 0-255; 0 = ungraded). The file holds a header, fixed-width
+little-endian tables and the UTF-8 text of every sentence:
+
+    offsets           Q[N+1]  byte range of sentence i in the blob
+    levels, words     B[N], H[N]
+    level_values      B[L]    the levels present, ascending
+    level_starts      I[L+1]  their ranges in by_level
+    by_level          I[N]    ids ordered by (level, words, id)
+    by_level_words    H[N]    word counts in that order, for bisect
+    by_length         I[N]    ids ordered by (words, id)
+    by_length_words   H[N]
+    hash_keys         Q[N]    8-byte BLAKE2b of each text, ascending
+    hash_ids          I[N]    the id for each key
+    blob              UTF-8 text
+
+Every table is a memoryview over the mapping, so opening the corpus
+reads only the header; sentences are decoded one at a time as they are
+picked. Selecting the candidates for a level and length range is two
+bisects, and sample() then draws k of them in O(k). The pages are shared
+through the OS page cache by all workers on a machine.
+"""
+
+import argparse
+import array
+import bisect
+import collections.abc
+import csv
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+
+SENTENCES = [
+    "भारत एक विशाल देश है और इसकी संस्कृति विविधता से भरपूर है।",
+    "गंगा नदी भारत की सबसे पवित्र नदियों में से एक मानी जाती है।",
+    "ताजमहल प्रेम का अद्भुत प्रतीक है।",
+    "हिमालय पर्वत श्रृंखला प्राकृतिक सौंदर्य का खजाना है।",
+    "दिल्ली भारत की राजधानी और ऐतिहासिक धरोहरों का केंद्र है।",
+    "सत्य और अहिंसा महात्मा गांधी के मुख्य सिद्धांत थे।",
+    "भारत में विभिन्न भाषाएँ और परंपराएँ एकता में बंधी हैं।",
+    "कड़ी मेहनत और दृढ़ निश्चय सफलता की कुंजी हैं।",
+    "पेड़ हमें स्वच्छ हवा और छाया प्रदान करते हैं।",
+    "पुस्तकें ज्ञान का सबसे बड़ा स्रोत होती हैं।"
+]
+
+MAGIC = b"RACORP\x00\x01"
+SECTIONS = (
+    ("offsets", "Q"),
+    ("levels", "B"),
+    ("words", "H"),
+    ("level_values", "B"),
+    ("level_starts", "I"),
+    ("by_level", "I"),
+    ("by_level_words", "H"),
+    ("by_length", "I"),
+    ("by_length_words", "H"),
+    ("hash_keys", "Q"),
+    ("hash_ids", "I"),
+    ("blob", "B"),
+)
+# magic, sentence count, level count, corpus fingerprint, (start, size) of every section
+HEADER = struct.Struct(f"<8sII20s{2 * len(SECTIONS)}Q")
+MAX_WORDS = 0xFFFF
+
+
+def corpus_fingerprint(sentences):
+    digest = hashlib.sha1()
+    for sentence in sentences:
+        digest.update(sentence.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def text_hash(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# ------------------------------------------------------------
+# Building
+# ------------------------------------------------------------
+def encode(items):
+    """The corpus file's bytes for (text, level) pairs, in id order."""
+    texts, levels = [], []
+    for text, level in items:
+        level = int(level)
+        if not 0 <= level <= 255:
+            raise ValueError(f"level {level} of {text!r} is outside 0-255")
+        texts.append(text)
+        levels.append(level)
+    n = len(texts)
+    blobs = [text.encode("utf-8") for text in texts]
+    words = [min(len(text.split()), MAX_WORDS) for text in texts]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+
+    by_level = sorted(range(n), key=lambda i: (levels[i], words[i], i))
+    level_values = sorted(set(levels))
+    sorted_levels = [levels[i] for i in by_level]
+    level_starts = [bisect.bisect_left(sorted_levels, level) for level in level_values] + [n]
+    by_length = sorted(range(n), key=lambda i: (words[i], i))
+    hashes = [text_hash(text) for text in texts]
+    by_hash = sorted(range(n), key=lambda i: hashes[i])
+
+    tables = {
+        "offsets": array.array("Q", offsets),
+        "levels": array.array("B", levels),
+        "words": array.array("H", words),
+        "level_values": array.array("B", level_values),
+        "level_starts": array.array("I", level_starts),
+        "by_level": array.array("I", by_level),
+        "by_level_words": array.array("H", [words[i] for i in by_level]),
+        "by_length": array.array("I", by_length),
+        "by_length_words": array.array("H", [words[i] for i in by_length]),
+        "hash_keys": array.array("Q", [hashes[i] for i in by_hash]),
+        "hash_ids": array.array("I", by_hash),
+    }
+    body = bytearray()
+    layout = []
+    for name, _ in SECTIONS:
+        body += b"\0" * (-(HEADER.size + len(body)) % 8)  # every table 8-byte aligned
+        if name == "blob":
+            data = b"".join(blobs)
+        else:
+            table = tables[name]
+            if sys.byteorder == "big":
+                table.byteswap()
+            data = table.tobytes()
+        layout += [HEADER.size + len(body), len(data)]
+        body += data
+    digest = bytes.fromhex(corpus_fingerprint(texts))
+    return HEADER.pack(MAGIC, n, len(level_values), digest, *layout) + bytes(body)
+
+
+def write_corpus(path, items):
+    """Build the corpus file at `path` (replaced atomically); returns its sentence count."""
+    data = encode(items)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return HEADER.unpack_from(data)[1]
+
+
+def read_items(path):
+    """(text, level) pairs from a CSV or JSONL file with `text` and optional `level` columns."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    return [(row["text"].strip(), row.get("level") or 0) for row in rows if row["text"].strip()]
+
+
+# ------------------------------------------------------------
+# Reading
+# ------------------------------------------------------------
+class MappedCorpus(collections.abc.Sequence):
+    """Read-only sequence of sentences over a corpus file's bytes (usually an mmap)."""
+
+    def __init__(self, buffer, path=None):
+        if sys.byteorder == "big":
+            raise ValueError("corpus files are little-endian; this machine is not")
+        view = memoryview(buffer)
+        magic, count, _, digest, *layout = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path or 'buffer'} is not a reading_aid corpus file")
+        self.path = path
+        self.fingerprint = digest.hex()
+        self._buffer = buffer
+        self._count = count
+        self._views = [view]
+        for (name, fmt), start, size in zip(SECTIONS, layout[::2], layout[1::2]):
+            table = view[start:start + size].cast(fmt)
+            self._views.append(table)
+            setattr(self, "_" + name, table)
+
+    @classmethod
+    def from_sentences(cls, sentences, level=0):
+        """An in-memory corpus for a plain list, all at one level"""
+        return cls(encode((text, level) for text in sentences))
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("sentence id out of range")
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def __contains__(self, text):
+        return self.find(text) is not None
+
+    def level(self, i):
+        return self._levels[i]
+
+    def words(self, i):
+        return self._words[i]
+
+    @property
+    def levels(self):
+        return tuple(self._level_values)
+
+    def find(self, text):
+        """Id of `text`, or None; a bisect on the hash table."""
+        key = text_hash(text)
+        pos = bisect.bisect_left(self._hash_keys, key)
+        while pos < self._count and self._hash_keys[pos] == key:
+            if self[self._hash_ids[pos]] == text:
+                return self._hash_ids[pos]
+            pos += 1
+        return None
+
+    def ids(self, level=None, min_words=None, max_words=None):
+        """Ids of the sentences at `level` with min_words..max_words words, as a memoryview."""
+        if level is None:
+            ids, words, lo, hi = self._by_length, self._by_length_words, 0, self._count
+        else:
+            slot = bisect.bisect_left(self._level_values, level)
+            if slot == len(self._level_values) or self._level_values[slot] != level:
+                return self._by_level[0:0]
+            ids, words = self._by_level, self._by_level_words
+            lo, hi = self._level_starts[slot], self._level_starts[slot + 1]
+        if min_words is not None:
+            lo = bisect.bisect_left(words, min_words, lo, hi)
+        if max_words is not None:
+            hi = bisect.bisect_right(words, max_words, lo, hi)
+        return ids[lo:hi]
+
+    def sample_ids(self, k, level=None, min_words=None, max_words=None, rng=random):
+        """k distinct ids drawn uniformly from ids(level, min_words, max_words)"""
+        pool = self.ids(level, min_words, max_words)
+        if k > len(pool):
+            raise ValueError(f"only {len(pool)} sentences match, {k} requested")
+        return [pool[p] for p in rng.sample(range(len(pool)), k)]
+
+    def sample(self, k, level=None, min_words=None, max_words=None, rng=random):
+        """k distinct sentences, like random.sample(sentences, k) restricted to a level / length range"""
+        return [self[i] for i in self.sample_ids(k, level, min_words, max_words, rng)]
+
+    def close(self):
+        """Unmap the file; views returned by ids() must have been released."""
+        for view in reversed(self._views):
+            view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def open_corpus(path):
+    """Memory-map a corpus file built by write_corpus()."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, "MADV_RANDOM"):
+        mapped.madvise(mmap.MADV_RANDOM)  # no readahead: a test touches a handful of pages
+    return MappedCorpus(mapped, path)
+
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+
+def get_corpus():
+    """The process-wide corpus: READING_AID_CORPUS if set, else the built-in SENTENCES."""
+    global _corpus
+    with _corpus_lock:
+        if _corpus is None:
+            path = os.environ.get("READING_AID_CORPUS")
+            _corpus = open_corpus(path) if path else MappedCorpus.from_sentences(SENTENCES)
+        return _corpus
+
+
+# ------------------------------------------------------------
+# Command line
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect a memory-mapped sentence corpus.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="CSV/JSONL with text (and level) columns -> corpus file")
+    build.add_argument("source")
+    build.add_argument("output")
+    info = commands.add_parser("info", help="sentence counts per level")
+    info.add_argument("corpus")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = write_corpus(args.output, read_items(args.source))
+        print(f"{count} sentences -> {args.output} ({os.path.getsize(args.output)} bytes)")
+    else:
+        corpus = open_corpus(args.corpus)
+        print(f"{len(corpus)} sentences, fingerprint {corpus.fingerprint}")
+        for level in corpus.levels:
+            ids = corpus.ids(level)
+            print(f"  level {level:3d}: {len(ids):7d} sentences, "
+                  f"{corpus.words(ids[0])}-{corpus.words(ids[-1])} words")
+            ids.release()
+        corpus.close()
+
+
+if __name__ == "__main__":
+    main()
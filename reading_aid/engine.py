@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Recognize-and-score: the part of a reading attempt every front-end shares.
+
+The Streamlit jobs (reading_aid/jobs.py) and the HTTP API
+(reading_aid/api.py) both go through these two functions, so a reading
+scores the same however it arrives. Each stage is timed on the caller's
+metrics.Attempt.
+"""
+
+from reading_aid import fluency
+from reading_aid.alignment import evaluate, missed_words
+from reading_aid.preprocess import preprocess
+
+
+def recognize_and_score(attempt, backend, index, hindi_text, audio):
+    """Preprocess and recognize a recording, then score it against `hindi_text`."""
+    with attempt.span("preprocess"):
+        audio, stats = preprocess(audio)
+    with attempt.span("recognize"):
+        user_speech = backend.recognize(audio)
+    result = score_transcript(attempt, index, hindi_text, user_speech, audio)
+    result["preprocess"] = stats._asdict()
+    return result
+
+
+def score_transcript(attempt, index, hindi_text, user_speech, audio=None):
+    """Result dict for one transcript; fluency needs the recording and is None without it."""
+    with attempt.span("score"):
+        accuracy = index.score(hindi_text, user_speech)
+        alignment = evaluate(hindi_text, user_speech)
+        return {
+            "transcript": user_speech,
+            "accuracy": accuracy,
+            "wer": alignment.wer,
+            "cer": alignment.cer,
+            "missed": missed_words(alignment),
+            "fluency": fluency.analyse(audio, len(hindi_text.split()))._asdict() if audio is not None else None,
+        }
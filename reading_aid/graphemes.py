@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Devanagari aksara (orthographic syllable) tokenizer.
+
+A plain code-point or extended-grapheme split breaks conjuncts such as
+क्ष, श्र, द्ध at the virama, so one written letter counts as two or three
+units. Here a cluster is
+
+    consonant [nukta] (virama [ZWJ|ZWNJ] consonant [nukta])* [virama] [signs]
+    independent-vowel [signs]
+
+where signs are matras, candrabindu, anusvara and visarga. Anything else
+keeps its combining marks, as in a normal grapheme split.
+
+Corpus words repeat a lot ("भारत", "है", "और"), so words are tokenized
+through an LRU memo and each distinct word is only split once per process.
+"""
+
+import functools
+import unicodedata
+
+VIRAMA = "्"
+NUKTA = "़"
+JOINERS = "‌‍"  # ZWNJ, ZWJ
+
+
+def _is_consonant(ch):
+    cp = ord(ch)
+    return 0x0915 <= cp <= 0x0939 or 0x0958 <= cp <= 0x095F or 0x0978 <= cp <= 0x097F
+
+
+def _is_sign(ch):
+    """Matras, candrabindu/anusvara/visarga and other combining marks."""
+    return unicodedata.category(ch) in ("Mn", "Mc", "Me") and ch != VIRAMA
+
+
+@functools.lru_cache(maxsize=8192)
+def word_aksharas(word):
+    """Aksara clusters of a single word, as a tuple (memoized)."""
+    clusters = []
+    i, n = 0, len(word)
+    while i < n:
+        start = i
+        if _is_consonant(word[i]):
+            i += 1
+            if i < n and word[i] == NUKTA:
+                i += 1
+            # virama + consonant keeps extending the conjunct
+            while i < n and word[i] == VIRAMA:
+                i += 1
+                while i < n and word[i] in JOINERS:
+                    i += 1
+                if i < n and _is_consonant(word[i]):
+                    i += 1
+                    if i < n and word[i] == NUKTA:
+                        i += 1
+                else:
+                    break
+        else:
+            i += 1
+        while i < n and (_is_sign(word[i]) or word[i] in JOINERS):
+            i += 1
+        clusters.append(word[start:i])
+    return tuple(clusters)
+
+
+def aksharas(text):
+    """Aksara clusters of `text`, with a single " " between words."""
+    clusters = []
+    for word in text.split():
+        if clusters:
+            clusters.append(" ")
+        clusters.extend(word_aksharas(word))
+    return clusters
+
+
+def cache_info():
+    return word_aksharas.cache_info()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Turn audio recorded in the browser into sr.AudioData.
+
+Mono PCM WAV is parsed in place: the AudioData wraps a memoryview of the
+uploaded buffer, so no temporary file and no copy of the samples is made.
+Multi-channel PCM is downmixed with NumPy.
+WebM/Ogg (and WAV variants we do not parse ourselves) are piped through
+ffmpeg's stdin/stdout and come back as 16 kHz mono 16-bit PCM.
+"""
+
+import struct
+import subprocess
+
+import speech_recognition as sr
+
+from reading_aid.preprocess import to_mono
+
+FFMPEG_RATE = 16000
+
+
+class AudioDecodeError(ValueError):
+    """The uploaded bytes are not audio we can decode."""
+
+
+def decode_audio(data):
+    """Decode recorded bytes (WAV, WebM or Ogg) into an sr.AudioData."""
+    view = memoryview(data).cast("B")
+    if view[:4] == b"RIFF" and view[8:12] == b"WAVE":
+        audio = _decode_wav(view)
+        if audio is not None:
+            return audio
+    elif view[:4] not in (b"OggS", b"\x1a\x45\xdf\xa3"):  # Ogg / EBML (WebM)
+        raise AudioDecodeError("Unsupported audio format")
+    return _decode_with_ffmpeg(view)
+
+
+def _decode_wav(view):
+    """Wrap the data chunk of a PCM WAV; None if ffmpeg must handle it."""
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(view):
+        chunk_id = bytes(view[pos:pos + 4])
+        (size,) = struct.unpack_from("<I", view, pos + 4)
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            if size < 16 or body + 16 > len(view):
+                raise AudioDecodeError("WAV fmt chunk is truncated")
+            fmt = struct.unpack_from("<HHIIHH", view, body)
+            if fmt[1] < 1 or fmt[2] == 0:
+                raise AudioDecodeError(f"WAV fmt chunk has {fmt[1]} channels at {fmt[2]} Hz")
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise AudioDecodeError("WAV data chunk before fmt chunk")
+            audio_format, channels, sample_rate, _, _, bits = fmt
+            if audio_format != 1 or bits not in (8, 16, 24, 32):
+                return None
+            # Streaming recorders often leave the size as 0 or 0xFFFFFFFF
+            end = len(view) if size in (0, 0xFFFFFFFF) else min(body + size, len(view))
+            sample_width = bits // 8
+            end -= (end - body) % (sample_width * channels)
+            frames = view[body:end]
+            if channels > 1:
+                if sample_width == 3:
+                    return None
+                frames = to_mono(frames, sample_width, channels)
+            return sr.AudioData(frames, sample_rate, sample_width)
+        pos = body + size + (size & 1)  # chunks are word aligned
+    raise AudioDecodeError("WAV file has no data chunk")
+
+
+def _decode_with_ffmpeg(view):
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-ar", str(FFMPEG_RATE),
+        "pipe:1",
+    ]
+    try:
+        proc = subprocess.run(cmd, input=view, capture_output=True, check=False)
+    except FileNotFoundError:
+        raise AudioDecodeError("ffmpeg is required to decode WebM/Ogg audio")
+    if proc.returncode != 0 or not proc.stdout:
+        raise AudioDecodeError(proc.stderr.decode("utf-8", "replace").strip() or "ffmpeg produced no audio")
+    return sr.AudioData(proc.stdout, FFMPEG_RATE, 2)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Background reading jobs for the Streamlit test page.
+
+Recording, recognition and scoring run on a bounded thread pool that is
+shared by every session in the server process. The page keeps only a
+ReadingJob handle in st.session_state and polls it, so a script run is
+never stuck behind the microphone or the recognizer.
+
+The job functions import the recording and scoring modules when they
+first run, on a worker thread: a page that never records from the
+server microphone never loads it, and importing this module is cheap.
+"""
+
+import concurrent.futures
+import os
+import threading
+import time
+
+from reading_aid import metrics
+
+MAX_WORKERS = int(os.environ.get("READING_AID_WORKERS", "8"))
+FLOWS = {"record_and_score": "record", "stream_and_score": "stream", "score_upload": "upload"}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide pool, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=MAX_WORKERS, thread_name_prefix="reading-job"
+            )
+        return _executor
+
+
+class ReadingJob:
+    """Handle for one submitted recording; `status` moves queued → recording → analysing.
+
+    Streaming jobs also update `partial_transcript` / `partial_score` while
+    the reader is still speaking. `attempt` times every stage; the page
+    adds collect / render and finishes it.
+    """
+
+    def __init__(self, fn, *args):
+        self.status = "queued"
+        self.partial_transcript = ""
+        self.partial_score = None
+        self.attempt = metrics.Attempt(FLOWS.get(fn.__name__, fn.__name__))
+        self.finished_at = None
+        self.future = get_executor().submit(self._run, fn, time.perf_counter(), *args)
+
+    def _run(self, fn, submitted, *args):
+        self.attempt.add("queue", time.perf_counter() - submitted)
+        try:
+            return fn(self, *args)
+        except Exception as e:
+            self.attempt.fail(e)
+            raise
+        finally:
+            self.finished_at = time.perf_counter()
+
+    def done(self):
+        return self.future.done()
+
+    def wait(self, timeout):
+        """Block for at most `timeout` seconds, returning early as soon as the job finishes."""
+        concurrent.futures.wait([self.future], timeout=timeout)
+        return self.future.done()
+
+    def result(self):
+        """The job's result dict; re-raises the sr exception if the job failed."""
+        return self.future.result()
+
+
+# ------------------------------------------------------------
+# Job functions
+# ------------------------------------------------------------
+def record_and_score(job, backend, index, hindi_text, noise_floor):
+    """Record one reading from the server microphone, transcribe and score it."""
+    import speech_recognition as sr
+
+    from reading_aid.microphone import get_microphone
+
+    recognizer = sr.Recognizer()  # per job; the session's calibration lives in noise_floor
+    microphone = get_microphone()
+    job.status = "recording"
+    with microphone.session() as source:
+        with job.attempt.span("calibrate"):
+            noise_floor.apply(recognizer, source)
+        with job.attempt.span("listen"):
+            audio = recognizer.listen(source, timeout=10, phrase_time_limit=15)
+    noise_floor.observe(audio, microphone, recognizer)
+    return _recognize_and_score(job, backend, index, hindi_text, audio)
+
+
+def stream_and_score(job, backend, index, hindi_text, noise_floor):
+    """Like record_and_score, but recognizes and scores while the reader speaks."""
+    import speech_recognition as sr
+
+    from reading_aid.engine import score_transcript
+    from reading_aid.microphone import get_microphone
+    from reading_aid.streaming import finish_stream, listen_streaming, open_stream
+
+    def on_partial(text):
+        job.partial_transcript = text
+        job.partial_score = index.score(hindi_text, text)
+
+    recognizer = sr.Recognizer()
+    microphone = get_microphone()
+    stream = open_stream(backend, on_partial=on_partial)
+    job.status = "recording"
+    with microphone.session() as source:
+        with job.attempt.span("calibrate"):
+            noise_floor.apply(recognizer, source)
+        with job.attempt.span("listen"):
+            audio = listen_streaming(recognizer, source, stream, timeout=10, phrase_time_limit=15)
+    noise_floor.observe(audio, microphone, recognizer)
+
+    job.status = "analysing"
+    with job.attempt.span("recognize"):  # only what is left after the reader stopped
+        user_speech = finish_stream(stream)
+    return score_transcript(job.attempt, index, hindi_text, user_speech, audio)
+
+
+def score_upload(job, backend, index, hindi_text, data):
+    """Decode audio recorded in the reader's browser, transcribe and score it."""
+    from reading_aid.ingest import decode_audio
+
+    with job.attempt.span("decode"):
+        audio = decode_audio(data)
+    return _recognize_and_score(job, backend, index, hindi_text, audio)
+
+
+def _recognize_and_score(job, backend, index, hindi_text, audio):
+    from reading_aid.engine import recognize_and_score
+
+    job.status = "analysing"
+    return recognize_and_score(job.attempt, backend, index, hindi_text, audio)
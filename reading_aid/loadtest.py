@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+"""
+Load test for streamlit_app.py: N simulated readers against one server.
+
+Starts the app as a real Streamlit server on localhost with the fake
+recognizer (READING_AID_BACKEND=fake) and drives every session through the
+same websocket protocol and upload endpoint a browser uses:
+home -> start -> three recorded sentences (st.audio_input) -> summary.
+Nothing leaves the machine; Streamlit's usage statistics are switched off.
+
+    python -m reading_aid.loadtest --sessions 20 [--audio a.wav b.wav ...]
+
+Without --audio a synthetic three-second recording is uploaded. The
+report has throughput, p50/p95/p99 latency per stage and the server's
+resident memory per open session (Linux only, from /proc).
+
+Stages:
+    load       websocket opened to the home page rendered
+    start      start button to the first sentence
+    upload     HTTP upload of one recording
+    sentence   recording submitted to the next sentence (or summary) rendered
+"""
+
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import wave
+
+import numpy as np
+import requests
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import UploadedFileInfo
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+STAGES = ("load", "start", "upload", "sentence")
+LINES_PER_TEST = 3
+MAX_ATTEMPTS = 3  # per sentence, when the app shows an error card instead of a score
+STAGE_TIMEOUT = 60.0
+SERVER_START_TIMEOUT = 60.0
+FULL_RUN = ForwardMsg.FINISHED_SUCCESSFULLY
+FRAGMENT_RUN = ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+def synthetic_recording(seconds=3.0, rate=16000):
+    """WAV bytes of voiced bursts with short gaps, like a reader pausing between words"""
+    t = np.arange(int(seconds * rate))
+    voiced = (t % (rate // 2)) > rate // 10
+    samples = (np.sin(2 * np.pi * 180 * t / rate) * 8000 * voiced).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+def rss_bytes(pid):
+    """Resident memory of a process, from /proc; None where that does not exist"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def widget_key(widget_id):
+    """The user key at the end of a Streamlit widget id ("$$ID-<hash>-<key>")"""
+    return widget_id.split("-", 2)[-1]
+
+
+# ------------------------------------------------------------
+# Server
+# ------------------------------------------------------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, fake_delay=None):
+    """streamlit_app.py on localhost with the fake backend; returns the process once healthy"""
+    env = dict(os.environ, READING_AID_BACKEND="fake", READING_AID_CAPTURE="browser")
+    env.pop("READING_AID_STREAMING", None)
+    # Attempts are persisted as in production, but not into the real results database
+    env.setdefault("READING_AID_DB", os.path.join(tempfile.gettempdir(), "reading_aid_loadtest.sqlite3"))
+    if fake_delay is not None:
+        env["READING_AID_FAKE_DELAY"] = str(fake_delay)
+    command = [
+        sys.executable, "-m", "streamlit", "run", APP,
+        "--server.headless", "true",
+        "--server.address", "127.0.0.1",
+        "--server.port", str(port),
+        "--server.enableXsrfProtection", "false",
+        "--browser.gatherUsageStats", "false",
+    ]
+    server = subprocess.Popen(command, cwd=os.path.dirname(APP), env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {server.returncode}")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).ok:
+                return server
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("streamlit did not become healthy in time")
+
+
+# ------------------------------------------------------------
+# One simulated reader
+# ------------------------------------------------------------
+class Run:
+    """What one script run (full or fragment) rendered"""
+
+    def __init__(self):
+        self.status = None
+        self.exception = None
+        self.widgets = {}  # element type -> (widget id, fragment id)
+        self.markdown = {}  # delta path -> last markdown body written there
+
+    def html(self):
+        return "".join(self.markdown.values())
+
+
+class Session:
+    """A reader going home -> start -> three sentences -> summary"""
+
+    def __init__(self, base_url, recording, timings):
+        self.base_url = base_url
+        self.recording = recording
+        self.timings = timings
+        self.ws = None
+        self.session_id = None
+        self.page_script_hash = ""
+        self.widgets = {}
+        self.errors = 0
+        self.finished = False
+
+    async def run(self, hold):
+        """Take the test, then keep the session open until `hold` is set"""
+        url = self.base_url.replace("http", "ws", 1) + "/_stcore/stream"
+        async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            self.ws = ws
+            with self.timed("load"):
+                await self.rerun()
+                await self.wait_for(lambda run: run.status == FULL_RUN)
+
+            button_id, _ = self.widget("button")
+            with self.timed("start"):
+                await self.rerun(WidgetState(id=button_id, trigger_value=True))
+                await self.wait_for(lambda run: run.status == FULL_RUN and "audio_input" in run.widgets)
+
+            for idx in range(LINES_PER_TEST):
+                await self.read_sentence(idx)
+
+            self.finished = True
+            await hold.wait()
+
+    async def read_sentence(self, idx):
+        for _ in range(MAX_ATTEMPTS):
+            audio_id, fragment_id = self.widget("audio_input")
+            with self.timed("upload"):
+                info = await asyncio.to_thread(self.upload, self.recording)
+            with self.timed("sentence"):
+                state = WidgetState(id=audio_id)
+                state.file_uploader_state_value.uploaded_file_info.append(info)
+                await self.rerun(state, fragment_id=fragment_id)
+                run = await self.wait_for(lambda run: self.advanced(run, idx) or self.failed(run))
+            if self.advanced(run, idx):
+                return
+            self.errors += 1
+        raise RuntimeError(f"sentence {idx + 1} failed {MAX_ATTEMPTS} times")
+
+    @staticmethod
+    def advanced(run, idx):
+        """A full run showing the next sentence's recorder, or the summary (no recorder)"""
+        if run.status != FULL_RUN:
+            return False
+        if "audio_input" not in run.widgets:
+            return True
+        return widget_key(run.widgets["audio_input"][0]).startswith(f"rec_{idx + 1}_")
+
+    @staticmethod
+    def failed(run):
+        """A result-card fragment run that ended on an error card"""
+        return run.status == FRAGMENT_RUN and 'class="status-' in run.html()
+
+    def widget(self, element_type):
+        """(widget id, fragment id) of the last rendered widget of this type"""
+        if element_type not in self.widgets:
+            raise RuntimeError(f"the app rendered no {element_type}")
+        return self.widgets[element_type]
+
+    # --- protocol ---
+    async def rerun(self, *widget_states, fragment_id=""):
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = ""
+        client_state.page_script_hash = self.page_script_hash
+        client_state.fragment_id = fragment_id
+        client_state.widget_states.widgets.extend(widget_states)
+        await self.ws.send(message.SerializeToString())
+
+    async def next_run(self):
+        run = Run()
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.ws.recv())
+            kind = message.WhichOneof("type")
+            if kind == "new_session":
+                self.session_id = message.new_session.initialize.session_id
+                self.page_script_hash = message.new_session.page_script_hash
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in ("button", "audio_input"):
+                    widget = (getattr(element, element_type).id, message.delta.fragment_id)
+                    run.widgets[element_type] = widget
+                    self.widgets[element_type] = widget
+                elif element_type == "exception":
+                    run.exception = element.exception.message
+                elif element_type == "markdown":
+                    path = tuple(message.metadata.delta_path)
+                    run.markdown[path] = element.markdown.body
+            elif kind == "script_finished":
+                run.status = message.script_finished
+                return run
+
+    async def wait_for(self, done):
+        async def until_done():
+            while True:
+                run = await self.next_run()
+                if run.exception:
+                    raise RuntimeError(f"the app raised: {run.exception}")
+                if done(run):
+                    return run
+        return await asyncio.wait_for(until_done(), STAGE_TIMEOUT)
+
+    def upload(self, data):
+        """Upload one recording the way st.audio_input does"""
+        file_id = uuid.uuid4().hex
+        name = f"{file_id}.wav"
+        upload_url = f"/_stcore/upload_file/{self.session_id}/{file_id}"
+        response = requests.put(self.base_url + upload_url,
+                                files={"file": (name, data, "audio/wav")}, timeout=STAGE_TIMEOUT)
+        response.raise_for_status()
+        info = UploadedFileInfo(name=name, size=len(data), file_id=file_id)
+        info.file_urls.file_id = file_id
+        info.file_urls.upload_url = upload_url
+        info.file_urls.delete_url = upload_url
+        return info
+
+    def timed(self, stage):
+        return _Timer(self.timings[stage])
+
+
+class _Timer:
+    def __init__(self, samples):
+        self.samples = samples
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.samples.append(time.perf_counter() - self.started)
+
+
+# ------------------------------------------------------------
+# Driver
+# ------------------------------------------------------------
+async def drive(base_url, recordings, sessions, ramp_seconds=0.0, pid=None):
+    """Run `sessions` readers against a running server; returns the raw measurements"""
+    timings = {stage: [] for stage in STAGES}
+    hold = asyncio.Event()
+    readers = [Session(base_url, recording, timings)
+               for recording, _ in zip(itertools.cycle(recordings), range(sessions))]
+
+    async def start(i, reader):
+        await asyncio.sleep(ramp_seconds * i / sessions)
+        await reader.run(hold)
+
+    rss_before = rss_bytes(pid) if pid else None
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(start(i, reader)) for i, reader in enumerate(readers)]
+    # Sessions stay open after their summary so the memory sample sees all of them
+    while not all(task.done() or reader.finished for task, reader in zip(tasks, readers)):
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    rss_peak = rss_bytes(pid) if pid else None
+    hold.set()
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    failures = [repr(outcome) for outcome in outcomes if isinstance(outcome, BaseException)]
+    return {
+        "sessions": sessions,
+        "completed": sessions - len(failures),
+        "failures": failures,
+        "error_cards": sum(reader.errors for reader in readers),
+        "elapsed": elapsed,
+        "timings": timings,
+        "rss_before": rss_before,
+        "rss_peak": rss_peak,
+    }
+
+
+def summarize(measured):
+    """Throughput, per-stage percentiles (ms) and memory per session"""
+    elapsed = measured["elapsed"]
+    report = {
+        "sessions": measured["sessions"],
+        "completed": measured["completed"],
+        "failures": measured["failures"],
+        "error_cards": measured["error_cards"],
+        "elapsed_seconds": round(elapsed, 2),
+        "sessions_per_second": round(measured["completed"] / elapsed, 2),
+        "sentences_per_second": round(len(measured["timings"]["sentence"]) / elapsed, 2),
+        "stages": {},
+        "memory_per_session_mb": None,
+    }
+    for stage, samples in measured["timings"].items():
+        if samples:
+            report["stages"][stage] = {
+                "count": len(samples),
+                **{f"p{q}_ms": round(percentile(samples, q) * 1000, 1) for q in (50, 95, 99)},
+                "max_ms": round(max(samples) * 1000, 1),
+            }
+    if measured["rss_before"] and measured["rss_peak"]:
+        grown = measured["rss_peak"] - measured["rss_before"]
+        report["memory_per_session_mb"] = round(grown / measured["sessions"] / 2 ** 20, 2)
+    return report
+
+
+def format_report(report):
+    lines = [
+        f"{report['completed']}/{report['sessions']} sessions in {report['elapsed_seconds']}s: "
+        f"{report['sessions_per_second']} sessions/s, {report['sentences_per_second']} sentences/s, "
+        f"{report['error_cards']} error cards",
+        f"{'stage':<10}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    for stage, row in report["stages"].items():
+        lines.append(f"{stage:<10}{row['count']:>7}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+                     f"{row['p99_ms']:>10}{row['max_ms']:>10}")
+    if report["memory_per_session_mb"] is not None:
+        lines.append(f"memory per open session: {report['memory_per_session_mb']} MB")
+    lines.extend(f"failed: {failure}" for failure in report["failures"])
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test streamlit_app.py with simulated readers")
+    parser.add_argument("--sessions", type=int, default=10, help="simultaneous readers (default: 10)")
+    parser.add_argument("--ramp", type=float, default=0.0, metavar="SECONDS",
+                        help="spread session starts over this many seconds")
+    parser.add_argument("--audio", nargs="*", default=[], metavar="WAV",
+                        help="pre-recorded readings, used round-robin (default: synthetic)")
+    parser.add_argument("--fake-delay", type=float, default=None, metavar="SECONDS",
+                        help="simulated recognition latency (READING_AID_FAKE_DELAY)")
+    parser.add_argument("--url", default=None,
+                        help="test an already running server instead (it must use the fake backend)")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    recordings = []
+    for path in args.audio:
+        with open(path, "rb") as f:
+            recordings.append(f.read())
+    recordings = recordings or [synthetic_recording()]
+
+    server = None
+    base_url, pid = args.url, None
+    if base_url is None:
+        port = free_port()
+        server = start_server(port, args.fake_delay)
+        base_url, pid = f"http://127.0.0.1:{port}", server.pid
+    try:
+        # One session first, so imports and the warm-up hook are not counted
+        asyncio.run(drive(base_url, recordings, 1))
+        measured = asyncio.run(drive(base_url, recordings, args.sessions, args.ramp, pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = summarize(measured)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if not report["failures"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Per-stage latency of the recording flow.
+
+Every reading attempt is an Attempt; each stage is timed with
+`with attempt.span("recognize"):` (or attempt.add() for a duration that
+was measured elsewhere). Stages, in order:
+
+    queue       waiting for a job worker (Streamlit) or a free slot (API)
+    calibrate   noise-floor calibration
+    listen      recording, until the reader stops
+    decode      decoding a browser upload
+    preprocess  trim / downmix / resample / normalize
+    recognize   the speech backend (recognize_google etc.)
+    score       accuracy, WER/CER and fluency
+    collect     job finished -> picked up by a script run (Streamlit)
+    render      result picked up -> shown
+
+Durations go straight into process-wide histograms, exported in the
+Prometheus text format by render() and, when READING_AID_METRICS_PORT is
+set, over HTTP at /metrics. When an attempt finishes, one JSON line with
+all its stages is logged on the "reading_aid.attempts" logger.
+
+A span costs two perf_counter() calls and a bisect under a short lock,
+so this stays on in production. Importing this module stays cheap too:
+the exception types behind the outcome labels and the HTTP server are
+only imported when they are first needed.
+"""
+
+import bisect
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+log = logging.getLogger("reading_aid.attempts")
+
+
+# ------------------------------------------------------------
+# Histograms
+# ------------------------------------------------------------
+class Histogram:
+    """Cumulative-bucket latency histogram, Prometheus style."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+_lock = threading.Lock()
+_histograms = {}  # (flow, stage) -> Histogram
+_attempts = {}  # (flow, outcome) -> count
+
+
+def observe(flow, stage, seconds):
+    with _lock:
+        histogram = _histograms.get((flow, stage))
+        if histogram is None:
+            histogram = _histograms[(flow, stage)] = Histogram()
+        histogram.observe(seconds)
+
+
+@functools.lru_cache(maxsize=None)
+def outcomes():
+    """(exception type, outcome label) pairs, checked in order"""
+    import speech_recognition as sr
+
+    from reading_aid.ingest import AudioDecodeError
+    return (
+        (sr.WaitTimeoutError, "timeout"),
+        (sr.UnknownValueError, "unintelligible"),
+        (sr.RequestError, "request_error"),
+        (AudioDecodeError, "decode_error"),
+    )
+
+
+def outcome_of(exc):
+    """Outcome label for the exception that ended an attempt"""
+    for exc_type, outcome in outcomes():
+        if isinstance(exc, exc_type):
+            return outcome
+    return "error"
+
+
+# ------------------------------------------------------------
+# Attempts
+# ------------------------------------------------------------
+class Attempt:
+    """The stage timings of one recording, from start to result on screen."""
+
+    def __init__(self, flow):
+        self.id = uuid.uuid4().hex[:12]
+        self.flow = flow
+        self.stages = {}
+        self.outcome = "ok"
+        self.started = time.perf_counter()
+        self._finished = False
+
+    @contextlib.contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        observe(self.flow, stage, seconds)
+
+    def fail(self, exc):
+        self.outcome = outcome_of(exc)
+
+    def finish(self, outcome=None):
+        """Count the attempt and log its JSON line; later calls do nothing."""
+        if self._finished:
+            return
+        self._finished = True
+        if outcome is not None:
+            self.outcome = outcome
+        with _lock:
+            key = (self.flow, self.outcome)
+            _attempts[key] = _attempts.get(key, 0) + 1
+        log.info(json.dumps({
+            "event": "reading_attempt",
+            "id": self.id,
+            "flow": self.flow,
+            "outcome": self.outcome,
+            "total": round(time.perf_counter() - self.started, 4),
+            "stages": {stage: round(seconds, 4) for stage, seconds in self.stages.items()},
+        }, ensure_ascii=False))
+
+
+def configure_log(destination):
+    """Send attempt lines to a file path, or "-" for stderr; empty leaves logging as configured."""
+    if not destination or log.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr) if destination == "-" else logging.FileHandler(destination)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+# ------------------------------------------------------------
+# Export
+# ------------------------------------------------------------
+def _labels(**labels):
+    return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        histograms = {key: (list(h.counts), h.sum, h.count) for key, h in _histograms.items()}
+        attempts = dict(_attempts)
+    lines = [
+        "# HELP reading_aid_stage_seconds Time spent in each stage of a reading attempt.",
+        "# TYPE reading_aid_stage_seconds histogram",
+    ]
+    for (flow, stage), (counts, total, count) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS + ("+Inf",), counts):
+            cumulative += n
+            lines.append(f"reading_aid_stage_seconds_bucket{{{_labels(flow=flow, stage=stage, le=bound)}}} {cumulative}")
+        lines.append(f"reading_aid_stage_seconds_sum{{{_labels(flow=flow, stage=stage)}}} {total}")
+        lines.append(f"reading_aid_stage_seconds_count{{{_labels(flow=flow, stage=stage)}}} {count}")
+    lines += [
+        "# HELP reading_aid_attempts_total Finished reading attempts by outcome.",
+        "# TYPE reading_aid_attempts_total counter",
+    ]
+    for (flow, outcome), count in sorted(attempts.items()):
+        lines.append(f"reading_aid_attempts_total{{{_labels(flow=flow, outcome=outcome)}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def start_http_server(port, host="0.0.0.0"):
+    """Serve /metrics from a daemon thread; returns the server."""
+    import http.server
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes every few seconds would drown the app's own output
+
+    server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def serve_from_env():
+    """start_http_server() on READING_AID_METRICS_PORT, if it is set."""
+    port = os.environ.get("READING_AID_METRICS_PORT")
+    return start_http_server(int(port)) if port else None
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Long-lived microphone and per-session noise-floor calibration.
+
+Opening sr.Microphone initializes PyAudio and the device every time, and
+adjust_for_ambient_noise then listens to silence for 0.5-1 s before the
+reader may start. Instead the process opens the microphone once
+(SharedMicrophone) and each reading session keeps its calibrated energy
+threshold (NoiseFloor). The threshold is only re-measured, in the
+background between sentences, when the silence at the start of a
+recording shows that the room got noticeably louder or quieter.
+
+listen() ends a recording after `pause_threshold` of silence (0.8 s by
+default), which would cut a reader off at every hesitation and leave the
+fluency metrics nothing to measure. Recordings set up here wait
+PAUSE_THRESHOLD, just longer than a hesitation, and keep up to
+KEEP_SILENCE of silence around speech, so a gap of HESITATION_SECONDS
+survives, also across the chunks of a streamed reading.
+"""
+
+import atexit
+import contextlib
+import threading
+
+import numpy as np
+import speech_recognition as sr
+
+from reading_aid.fluency import HESITATION_SECONDS
+
+CALIBRATION_SECONDS = 0.5
+PAUSE_THRESHOLD = HESITATION_SECONDS + 0.25  # just longer than a hesitation: the reader is done
+KEEP_SILENCE = HESITATION_SECONDS
+LEAD_SECONDS = 0.25  # listen() keeps at least this much pre-speech audio, enough to measure silence
+DRIFT_FACTOR = 1.5
+
+
+class SharedMicrophone:
+    """One open microphone per process; recordings take turns on it."""
+
+    def __init__(self, device_index=None):
+        self.device_index = device_index
+        self._mic = None
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def session(self):
+        """Exclusive use of the open microphone, like `with sr.Microphone() as source`."""
+        with self._lock:
+            if self._mic is None:
+                mic = sr.Microphone(device_index=self.device_index)
+                mic.__enter__()
+                self._mic = mic
+                atexit.register(self.close)
+            self._drain()
+            yield self._mic
+
+    def _drain(self):
+        """Drop audio that piled up in the device buffer while nobody was listening."""
+        stream = getattr(self._mic, "stream", None)
+        if stream is None:
+            return
+        try:
+            available = stream.pyaudio_stream.get_read_available()
+            if available:
+                stream.read(available)
+        except (AttributeError, OSError):
+            pass
+
+    def close(self):
+        with self._lock:
+            if self._mic is not None:
+                self._mic.__exit__(None, None, None)
+                self._mic = None
+
+
+class NoiseFloor:
+    """Calibrated energy threshold kept for one reading session."""
+
+    def __init__(self):
+        self.energy_threshold = None
+        self._refreshing = threading.Lock()
+
+    def apply(self, recognizer, source):
+        """Set up `recognizer` for `source`, calibrating only the first time."""
+        recognizer.pause_threshold = PAUSE_THRESHOLD
+        recognizer.non_speaking_duration = KEEP_SILENCE
+        if self.energy_threshold is None:
+            recognizer.adjust_for_ambient_noise(source, duration=CALIBRATION_SECONDS)
+            self.energy_threshold = recognizer.energy_threshold
+        else:
+            recognizer.energy_threshold = self.energy_threshold
+
+    def observe(self, audio, microphone, recognizer=None):
+        """Compare a recording's leading silence with the estimate; refresh it if it drifted."""
+        if self.energy_threshold is None:
+            return
+        ratio = (recognizer or sr.Recognizer()).dynamic_energy_ratio
+        expected = self.energy_threshold / ratio
+        lead = audio.get_raw_data(convert_width=2)[: int(audio.sample_rate * LEAD_SECONDS) * 2]
+        if not lead:
+            return
+        samples = np.frombuffer(lead, dtype=np.int16).astype(np.float64)
+        energy = float(np.sqrt(np.mean(samples * samples)))
+        if expected / DRIFT_FACTOR <= energy <= expected * DRIFT_FACTOR:
+            return
+        if self._refreshing.acquire(blocking=False):
+            threading.Thread(target=self._refresh, args=(microphone,), daemon=True).start()
+
+    def _refresh(self, microphone):
+        try:
+            recognizer = sr.Recognizer()
+            with microphone.session() as source:
+                recognizer.adjust_for_ambient_noise(source, duration=CALIBRATION_SECONDS)
+            self.energy_threshold = recognizer.energy_threshold
+        except OSError:
+            pass  # keep the old estimate if the device is unavailable
+        finally:
+            self._refreshing.release()
+
+
+_microphone = None
+_microphone_lock = threading.Lock()
+
+
+def get_microphone():
+    """The process-wide SharedMicrophone."""
+    global _microphone
+    with _microphone_lock:
+        if _microphone is None:
+            _microphone = SharedMicrophone()
+        return _microphone
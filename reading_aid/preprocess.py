@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Audio clean-up between capture and the recognizer.
+
+    1. energy VAD on 20 ms frames, computed over a zero-copy NumPy view of
+       the PCM buffer; leading/trailing silence is cut (keeping 200 ms)
+    2. downmix to mono (uploads may be stereo)
+    3. resample to 16 kHz, the rate the recognizers work at
+    4. loudness-normalize to a fixed RMS level, without clipping
+
+Only the kept slice of the view is converted to float, so the work scales
+with the speech, not with the length of the recording. The output is
+16 kHz mono 16-bit, which is what gets FLAC-encoded and uploaded.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import speech_recognition as sr
+
+TARGET_RATE = 16000
+FRAME_SECONDS = 0.02
+PAD_SECONDS = 0.2
+TARGET_RMS = 0.1     # about -20 dBFS
+PEAK_LIMIT = 0.99
+FIR_TAPS = 63
+
+PreprocessStats = namedtuple("PreprocessStats", "input_bytes output_bytes input_seconds output_seconds")
+
+_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+def pcm_view(frame_data, sample_width, channels=1):
+    """Integer samples as an (n, channels) view of `frame_data` (no copy for 8/16/32-bit)."""
+    if sample_width == 3:
+        # 24-bit has no NumPy dtype: widen to int32 (the one case that copies)
+        raw = np.frombuffer(frame_data, dtype=np.uint8)
+        raw = raw[: len(raw) - len(raw) % 3].reshape(-1, 3)
+        samples = (raw[:, 0].astype(np.int32) | (raw[:, 1].astype(np.int32) << 8)
+                   | (raw[:, 2].astype(np.int8).astype(np.int32) << 16)) << 8
+    else:
+        samples = np.frombuffer(frame_data, dtype=_DTYPES[sample_width])
+        samples = samples[: len(samples) - len(samples) % channels]
+    return samples.reshape(-1, channels)
+
+
+def to_float(samples):
+    """Scale integer samples to float32 in [-1, 1)."""
+    if samples.dtype == np.uint8:
+        return (samples.astype(np.float32) - 128.0) / 128.0
+    return samples.astype(np.float32) / float(-np.iinfo(samples.dtype).min)
+
+
+def frame_rms(samples, rate, frame_seconds=FRAME_SECONDS):
+    """RMS energy of consecutive frames of a (n, channels) view, on the float scale."""
+    frame = max(int(rate * frame_seconds), 1)
+    usable = len(samples) - len(samples) % frame
+    frames = samples[:usable].reshape(-1, frame * samples.shape[1])  # still a view
+    if samples.dtype == np.uint8:
+        centered = frames.astype(np.float32) - 128.0
+        return np.sqrt(np.mean(centered * centered, axis=1)) / 128.0
+    scale = float(-np.iinfo(samples.dtype).min)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1)) / scale
+
+
+def voiced_mask(energy, noise_factor=3.0, peak_factor=0.05):
+    """Frames whose energy clears a threshold adapted to the noise floor and the peak."""
+    if not len(energy):
+        return np.zeros(0, dtype=bool)
+    noise = np.percentile(energy, 10)
+    threshold = max(noise * noise_factor, energy.max() * peak_factor, 1e-4)
+    return energy > threshold
+
+
+def speech_bounds(energy):
+    """First and last voiced frame, or None."""
+    voiced = np.flatnonzero(voiced_mask(energy))
+    if not len(voiced):
+        return None
+    return voiced[0], voiced[-1]
+
+
+def downmix(samples):
+    return samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+
+
+def resample(x, src_rate, dst_rate=TARGET_RATE):
+    """Windowed-sinc low-pass (when downsampling) followed by linear interpolation."""
+    if src_rate == dst_rate or not len(x):
+        return x
+    if dst_rate < src_rate:
+        cutoff = 0.5 * dst_rate / src_rate * 0.9
+        n = np.arange(FIR_TAPS) - (FIR_TAPS - 1) / 2
+        taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(FIR_TAPS)
+        x = np.convolve(x, (taps / taps.sum()).astype(np.float32), mode="same")
+    positions = np.arange(int(len(x) * dst_rate / src_rate)) * (src_rate / dst_rate)
+    return np.interp(positions, np.arange(len(x)), x).astype(np.float32)
+
+
+def normalize_loudness(x):
+    rms = float(np.sqrt(np.mean(x * x))) if len(x) else 0.0
+    if rms < 1e-6:
+        return x
+    gain = TARGET_RMS / rms
+    peak = float(np.abs(x).max())
+    gain = min(gain, PEAK_LIMIT / peak)
+    return x * gain
+
+
+def to_pcm16(x):
+    return (np.clip(x, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def to_mono(frame_data, sample_width, channels):
+    """Downmix interleaved PCM to mono AudioData frame bytes of the same width."""
+    samples = pcm_view(frame_data, sample_width, channels)
+    mixed = downmix(samples)
+    return mixed.astype(samples.dtype).tobytes()
+
+
+def preprocess(audio, channels=1):
+    """Trim, downmix, resample and normalize; returns (AudioData, PreprocessStats)."""
+    samples = pcm_view(audio.frame_data, audio.sample_width, channels)
+    rate = audio.sample_rate
+    input_seconds = len(samples) / rate
+
+    bounds = speech_bounds(frame_rms(samples, rate))
+    if bounds is not None:
+        frame = max(int(rate * FRAME_SECONDS), 1)
+        pad = int(rate * PAD_SECONDS)
+        start = max(bounds[0] * frame - pad, 0)
+        end = min((bounds[1] + 1) * frame + pad, len(samples))
+        samples = samples[start:end]  # still a view: only this part is converted
+
+    x = normalize_loudness(resample(downmix(to_float(samples)), rate))
+    pcm = to_pcm16(x).tobytes()
+    stats = PreprocessStats(
+        input_bytes=len(audio.frame_data),
+        output_bytes=len(pcm),
+        input_seconds=round(input_seconds, 3),
+        output_seconds=round(len(pcm) / 2 / TARGET_RATE, 3),
+    )
+    return sr.AudioData(pcm, TARGET_RATE, 2), stats
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Speech-recognition backends shared by dyslexia.py and streamlit_app.py.
+
+The backend is picked with the READING_AID_BACKEND environment variable:
+    google  Google Web Speech API (default, needs internet)
+    vosk    offline Vosk model running on the CPU
+            (pip install vosk, model directory in READING_AID_VOSK_MODEL)
+    fake    replays canned transcripts, for load tests without network
+            (one transcript per line in READING_AID_FAKE_TRANSCRIPTS)
+
+Every backend raises sr.UnknownValueError / sr.RequestError exactly like
+recognize_google, so callers keep their existing error handling. Real
+backends sit behind the recognition cache (reading_aid/cache.py).
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+
+import speech_recognition as sr
+
+from reading_aid.cache import UNKNOWN, get_cache
+
+LANGUAGE = "hi-IN"
+
+DEFAULT_FAKE_TRANSCRIPTS = (
+    "भारत एक विशाल देश है और इसकी संस्कृति विविधता से भरपूर है",
+    "गंगा नदी भारत की सबसे पवित्र नदियों में से एक मानी जाती है",
+    "ताजमहल प्रेम का प्रतीक है",
+)
+
+
+# ------------------------------------------------------------
+# Backends
+# ------------------------------------------------------------
+class GoogleBackend:
+    """Google Web Speech API (the original behaviour)."""
+
+    name = "google"
+    cacheable = True
+
+    def __init__(self, recognizer=None):
+        self.recognizer = recognizer or sr.Recognizer()
+
+    def recognize(self, audio, language=LANGUAGE):
+        return self.recognizer.recognize_google(audio, language=language)
+
+
+class VoskBackend:
+    """Offline recognition with a local Vosk model, no network needed."""
+
+    name = "vosk"
+    cacheable = True
+    SAMPLE_RATE = 16000
+
+    def __init__(self, model_path=None):
+        try:
+            import vosk
+        except ImportError:
+            raise RuntimeError("Vosk backend needs: pip install vosk")
+        model_path = model_path or os.environ.get("READING_AID_VOSK_MODEL")
+        if not model_path:
+            raise RuntimeError("Set READING_AID_VOSK_MODEL to a Vosk model directory")
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        # The model is read-only and can be shared by every recognizer
+        self.model = vosk.Model(model_path)
+
+    def recognize(self, audio, language=LANGUAGE):
+        # A Vosk model covers one language, so `language` is not used here
+        rec = self._vosk.KaldiRecognizer(self.model, self.SAMPLE_RATE)
+        pcm = audio.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2)
+        rec.AcceptWaveform(bytes(pcm))  # uploads may hand us a memoryview
+        text = json.loads(rec.FinalResult()).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def stream(self, language=LANGUAGE, on_partial=None):
+        from reading_aid.streaming import VoskStream
+        return VoskStream(self, language, on_partial)
+
+
+class FakeBackend:
+    """Replays canned transcripts in order; an empty line acts as unintelligible audio."""
+
+    name = "fake"
+    cacheable = False  # replaying in order is the point; caching would freeze it
+
+    def __init__(self, transcripts=None, delay=None):
+        if transcripts is None:
+            transcripts = _load_fake_transcripts()
+        if delay is None:
+            delay = float(os.environ.get("READING_AID_FAKE_DELAY", "0"))
+        self.delay = delay
+        self._transcripts = itertools.cycle(list(transcripts) or [""])
+        self._lock = threading.Lock()
+
+    def recognize(self, audio, language=LANGUAGE):
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            text = next(self._transcripts)
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def stream(self, language=LANGUAGE, on_partial=None):
+        from reading_aid.streaming import FakeStream
+        return FakeStream(self, language, on_partial)
+
+
+class CachedBackend:
+    """Wraps a recognition backend so duplicate audio is never recognized twice."""
+
+    def __init__(self, backend, cache):
+        self.backend = backend
+        self.cache = cache
+        self.name = backend.name
+
+    def __getattr__(self, attr):
+        # Anything else (e.g. stream()) is served by the wrapped backend
+        return getattr(self.backend, attr)
+
+    def recognize(self, audio, language=LANGUAGE):
+        key = self.cache.key(audio, language, self.name)
+        text = self.cache.get(key)
+        if text is None:
+            try:
+                text = self.backend.recognize(audio, language=language)
+            except sr.UnknownValueError:
+                text = UNKNOWN
+            self.cache.put(key, text)
+        if text == UNKNOWN:
+            raise sr.UnknownValueError()
+        return text
+
+
+def _load_fake_transcripts():
+    path = os.environ.get("READING_AID_FAKE_TRANSCRIPTS")
+    if not path:
+        return DEFAULT_FAKE_TRANSCRIPTS
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f]
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "vosk": VoskBackend,
+    "fake": FakeBackend,
+}
+
+
+def get_backend(name=None, cache=None):
+    """Create the backend named by `name` or READING_AID_BACKEND (default: google).
+
+    Real backends are wrapped in the shared recognition cache unless
+    `cache` is False or READING_AID_CACHE=0.
+    """
+    name = (name or os.environ.get("READING_AID_BACKEND") or "google").lower()
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown recognition backend {name!r}, choose from {sorted(BACKENDS)}")
+    backend = backend_cls()
+    if cache is None:
+        cache = backend.cacheable and os.environ.get("READING_AID_CACHE", "1") != "0"
+    if cache:
+        backend = CachedBackend(backend, get_cache())
+    return backend
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Reference-sentence index for the scoring path.
+
+Each reference sentence is preprocessed once - a plain list when the
+index is built, a memory-mapped corpus (reading_aid/corpus.py) one
+sentence at a time as they are first used:
+    processed   the exact sorted-token string fuzz.token_sort_ratio
+                derives from it, so scores stay identical to the original
+    normalized  NFC text with danda/punctuation stripped and nukta
+                forms folded to their base consonant
+    tokens      the normalized words as a sorted tuple
+    aksharas    the normalized text split into aksara clusters
+
+Scoring a transcript then only processes the transcript side.
+
+score_matrix() scores many transcripts against many references at once for
+bulk rescoring; it returns exactly the numbers token_sort_ratio would.
+"""
+
+import threading
+import unicodedata
+from collections import namedtuple
+
+from fuzzywuzzy import fuzz, utils
+
+from reading_aid.corpus import corpus_fingerprint
+from reading_aid.graphemes import aksharas
+
+NUKTA = "़"
+# Precomposed nukta consonants (क़ ख़ ग़ ज़ ड़ ढ़ फ़ य़) fold to the plain letter
+_FOLD = {0x0958 + i: base for i, base in enumerate("कखगजडढफय")}
+_FOLD[ord(NUKTA)] = None
+
+SentenceEntry = namedtuple("SentenceEntry", "id text processed normalized tokens aksharas")
+
+
+def normalize(text):
+    """NFC, strip danda and punctuation, fold nukta forms, collapse whitespace."""
+    text = unicodedata.normalize("NFC", text).translate(_FOLD).casefold()
+    text = "".join(" " if unicodedata.category(ch)[0] == "P" else ch for ch in text)
+    return " ".join(text.split())
+
+
+def fuzz_process(text):
+    """The preprocessing fuzz.token_sort_ratio applies to each of its inputs."""
+    tokens = utils.full_process(text, force_ascii=True).split()
+    return " ".join(sorted(tokens)).strip()
+
+
+def _build_entry(sentence_id, text):
+    normalized = normalize(text)
+    return SentenceEntry(
+        id=sentence_id,
+        text=text,
+        processed=fuzz_process(text),
+        normalized=normalized,
+        tokens=tuple(sorted(normalized.split())),
+        aksharas=tuple(aksharas(normalized)),
+    )
+
+
+def _fingerprint(sentences):
+    return getattr(sentences, "fingerprint", None) or corpus_fingerprint(sentences)
+
+
+class SentenceIndex:
+    """Preprocessed reference sentences, looked up by id or by text.
+
+    A MappedCorpus is never copied: its entries are built on first use and
+    text is looked up through the corpus's hash table.
+    """
+
+    def __init__(self, sentences):
+        self.source = sentences
+        self.mapped = hasattr(sentences, "find")
+        self.sentences = sentences if self.mapped else list(sentences)
+        self.fingerprint = _fingerprint(self.sentences)
+        self._by_id = {}
+        self._by_text = {}
+        if not self.mapped:
+            for i in range(len(self.sentences)):
+                self.entry(i)
+
+    def __len__(self):
+        return len(self.sentences)
+
+    @property
+    def entries(self):
+        """Every entry in id order; for a mapped corpus this builds them all."""
+        return [self.entry(i) for i in range(len(self.sentences))]
+
+    def entry(self, reference):
+        """Entry for a sentence id or text; unknown text is indexed on first use."""
+        if isinstance(reference, int):
+            if reference < 0:
+                reference += len(self.sentences)
+            entry = self._by_id.get(reference)
+            if entry is None:
+                text = self.sentences[reference]
+                entry = self._by_id[reference] = _build_entry(reference, text)
+                self._by_text.setdefault(text, entry)
+            return entry
+        entry = self._by_text.get(reference)
+        if entry is None:
+            sentence_id = self.sentences.find(reference) if self.mapped else None
+            if sentence_id is not None:
+                return self.entry(sentence_id)
+            entry = self._by_text[reference] = _build_entry(None, reference)
+        return entry
+
+    def score(self, reference, transcript):
+        """Same value as fuzz.token_sort_ratio(reference_text, transcript)."""
+        if transcript is None:
+            return 0
+        return fuzz.ratio(self.entry(reference).processed, fuzz_process(transcript))
+
+    def score_matrix(self, transcripts, workers=-1):
+        """Score `transcripts` against every sentence in the index, see score_matrix()."""
+        return _score_processed(transcripts, [entry.processed for entry in self.entries], workers)
+
+
+def score_matrix(transcripts, references, workers=-1):
+    """N×M uint8 matrix where cell [i, j] == fuzz.token_sort_ratio(references[j], transcripts[i]).
+
+    rapidfuzz computes the normalized Indel similarity - the same function
+    python-Levenshtein's ratio() calls - for all pairs in C, on `workers`
+    threads (-1 = all cores) with the GIL released. Rounding then follows
+    fuzzywuzzy's int(round(100 * ratio)), so historical scores stay comparable.
+    """
+    return _score_processed(transcripts, [fuzz_process(r) for r in references], workers)
+
+
+def _score_processed(transcripts, processed_refs, workers):
+    import numpy as np  # bulk rescoring only; not needed to score single readings
+    from rapidfuzz.distance import Indel
+    from rapidfuzz.process import cdist
+
+    missing = [i for i, t in enumerate(transcripts) if t is None]
+    processed = [fuzz_process(t) if t is not None else "" for t in transcripts]
+    ratios = cdist(processed, processed_refs, scorer=Indel.normalized_similarity,
+                   dtype=np.float64, workers=workers)
+    scores = np.rint(100 * ratios).astype(np.uint8)
+    scores[missing] = 0  # token_sort_ratio returns 0 for a None transcript
+    return scores
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index(sentences):
+    """Process-wide index for `sentences`, rebuilt only when the corpus changes."""
+    global _index
+    with _index_lock:
+        if _index is None or (
+            sentences is not _index.source
+            and _fingerprint(sentences) != _index.fingerprint
+        ):
+            _index = SentenceIndex(sentences)
+        return _index
+
+
+def band(accuracy):
+    """Threshold band of a score, as both front-ends and the reports use them: "<70", "70-85" or "≥85"."""
+    if accuracy < 70:
+        return "<70"
+    if accuracy < 85:
+        return "70-85"
+    return "≥85"
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent results: one row per reading attempt in SQLite.
+
+The database runs in WAL mode, so reports can read while the app writes.
+add() only puts the row on a queue; a background thread commits queued
+rows in batches (up to BATCH_SIZE rows, or whatever arrived within
+FLUSH_SECONDS of the first one), so the recording flow never waits on
+the disk. Rows still queued at exit are written by an atexit hook.
+
+Rollups: per sentence, per school and per week, rollup_* tables hold
+attempt counts, the accuracy sum and how many scores fell in each band
+(<70, 70-85, >=85, the thresholds both front-ends report). An AFTER INSERT
+trigger updates them in the same transaction as the attempt, so they are
+always current and reading them never scans the attempts table
+(reading_aid/analytics.py, pages/analytics.py). A database created before
+the rollups existed is backfilled once when it is opened.
+
+Location: READING_AID_DB (default ~/.local/share/reading_aid/results.sqlite3);
+READING_AID_RESULTS=0 turns persistence off.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "reading_aid", "results.sqlite3")
+BATCH_SIZE = 256
+FLUSH_SECONDS = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id          INTEGER PRIMARY KEY,
+    attempt_id  TEXT NOT NULL,
+    created_at  REAL NOT NULL,  -- unix seconds
+    session     TEXT,           -- one test by one reader (calibrates reading_aid/adaptive.py)
+    school      TEXT,
+    flow        TEXT NOT NULL,  -- record / stream / upload / cli / api
+    outcome     TEXT NOT NULL,  -- ok / timeout / unintelligible / request_error / ...
+    sentence_id INTEGER,        -- id in the corpus (reading_aid/corpus.py)
+    sentence    TEXT NOT NULL,
+    transcript  TEXT,
+    accuracy    INTEGER,
+    wer         REAL,
+    cer         REAL,
+    missed      TEXT,           -- JSON list of words
+    fluency     TEXT,           -- JSON FluencyMetrics
+    timings     TEXT            -- JSON {stage: seconds}
+);
+CREATE INDEX IF NOT EXISTS attempts_created_at ON attempts (created_at);
+"""
+COLUMNS = ("attempt_id", "created_at", "session", "school", "flow", "outcome", "sentence_id", "sentence",
+           "transcript", "accuracy", "wer", "cer", "missed", "fluency", "timings")
+INSERT = f"INSERT INTO attempts ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+# ------------------------------------------------------------
+# Rollups
+# ------------------------------------------------------------
+# rollup name -> grouping key, as an expression over an attempts row ({row}.column)
+ROLLUPS = {
+    "sentence": "{row}sentence",
+    "school": "COALESCE({row}school, '')",
+    "week": "date({row}created_at, 'unixepoch', 'weekday 0', '-6 days')",  # the week's Monday
+}
+# rollup column -> its contribution from one attempts row
+ROLLUP_COLUMNS = {
+    "attempts": "1",
+    "scored": "{row}accuracy IS NOT NULL",
+    "accuracy_sum": "COALESCE({row}accuracy, 0)",
+    "band_low": "COALESCE({row}accuracy < 70, 0)",
+    "band_mid": "COALESCE({row}accuracy >= 70 AND {row}accuracy < 85, 0)",
+    "band_high": "COALESCE({row}accuracy >= 85, 0)",
+}
+
+
+def _rollup_schema():
+    statements = []
+    upserts = []
+    names = ", ".join(ROLLUP_COLUMNS)
+    for name, key in ROLLUPS.items():
+        columns = ", ".join(f"{column} INTEGER NOT NULL" for column in ROLLUP_COLUMNS)
+        statements.append(f"CREATE TABLE IF NOT EXISTS rollup_{name} (key TEXT PRIMARY KEY, {columns});")
+        values = ", ".join(expr.format(row="NEW.") for expr in ROLLUP_COLUMNS.values())
+        updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in ROLLUP_COLUMNS)
+        upserts.append(
+            f"INSERT INTO rollup_{name} (key, {names}) VALUES ({key.format(row='NEW.')}, {values}) "
+            f"ON CONFLICT (key) DO UPDATE SET {updates};"
+        )
+    statements.append(
+        "CREATE TRIGGER IF NOT EXISTS attempts_rollup AFTER INSERT ON attempts BEGIN\n    "
+        + "\n    ".join(upserts) + "\nEND;"
+    )
+    return "\n".join(statements)
+
+
+ROLLUP_SCHEMA = _rollup_schema()
+
+
+def rebuild_rollups(conn):
+    """Recompute every rollup table from the attempts table (one full scan)."""
+    names = ", ".join(ROLLUP_COLUMNS)
+    sums = ", ".join(f"SUM({expr.format(row='')})" for expr in ROLLUP_COLUMNS.values())
+    for name, key in ROLLUPS.items():
+        conn.execute(f"DELETE FROM rollup_{name}")
+        conn.execute(f"INSERT INTO rollup_{name} (key, {names}) "
+                     f"SELECT {key.format(row='')}, {sums} FROM attempts GROUP BY 1")
+
+
+def migrate(conn):
+    """Create or upgrade the schema; backfills rollups that did not exist yet."""
+    with conn:
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(attempts)")}
+        if "school" not in columns:  # databases from before schools were recorded
+            conn.execute("ALTER TABLE attempts ADD COLUMN school TEXT")
+        had_rollups = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'attempts_rollup'"
+        ).fetchone()
+        conn.executescript(ROLLUP_SCHEMA)
+        if not had_rollups:
+            rebuild_rollups(conn)
+
+
+_STOP = object()
+log = logging.getLogger(__name__)
+
+
+def connect(path):
+    """A connection with the store's pragmas; WAL is persistent, the rest per connection."""
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; a crash loses at most the last batch
+    return conn
+
+
+class ResultStore:
+    """Append-only attempt log with a background batch writer."""
+
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = connect(path)
+        migrate(conn)
+        conn.close()
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_loop, name="results-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, attempt, sentence, result=None, sentence_id=None, session=None, school=None):
+        """Queue one finished metrics.Attempt with its result dict (None if it failed)."""
+        result = result or {}
+        fluency = result.get("fluency")
+        self._queue.put((
+            attempt.id,
+            time.time(),
+            session,
+            school,
+            attempt.flow,
+            attempt.outcome,
+            sentence_id,
+            sentence,
+            result.get("transcript"),
+            result.get("accuracy"),
+            result.get("wer"),
+            result.get("cer"),
+            json.dumps(result["missed"], ensure_ascii=False) if "missed" in result else None,
+            json.dumps(fluency) if fluency is not None else None,
+            json.dumps({stage: round(seconds, 4) for stage, seconds in attempt.stages.items()}),
+        ))
+
+    def flush(self):
+        """Block until every queued row is committed."""
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout=10)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_seconds
+        while batch[-1] is not _STOP and len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _insert(self, conn, rows):
+        try:
+            with conn:
+                conn.executemany(INSERT, rows)
+            return
+        except sqlite3.Error:
+            if len(rows) == 1:
+                log.exception("dropped result row for attempt %s", rows[0][0])
+                return
+        # One bad row rolls back the whole batch; retry one by one so only it is lost
+        for row in rows:
+            self._insert(conn, [row])
+
+    def _write_loop(self):
+        conn = connect(self.path)
+        try:
+            while True:
+                batch = self._next_batch()
+                rows = [row for row in batch if row is not _STOP]
+                try:
+                    if rows:
+                        self._insert(conn, rows)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(rows) < len(batch):
+                    return
+        finally:
+            conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def db_path():
+    return os.environ.get("READING_AID_DB") or DEFAULT_PATH
+
+
+def get_store():
+    """The process-wide ResultStore, or None with READING_AID_RESULTS=0."""
+    global _store
+    if os.environ.get("READING_AID_RESULTS", "1") == "0":
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ResultStore(db_path())
+        return _store
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming mode: transcribe and score while the reader is still speaking.
+
+listen_streaming() records in short chunks. It runs the same loop as
+Recognizer.listen_in_background, but on the already-open shared
+microphone. Each chunk goes straight to an incremental stream, so
+recognition overlaps with recording and only the last chunk is left to
+recognize once the reader stops.
+
+Streams (open_stream):
+    backend.stream()   backends with native incremental decoding (Vosk),
+                       and the fake backend, which reveals its canned text
+    ChunkedStream      any one-shot backend: chunks are recognized in the
+                       background as they arrive and joined in order
+
+Every stream offers accept(chunk), partial() and finish(). The optional
+on_partial(text) callback fires whenever the partial transcript grows.
+"""
+
+import concurrent.futures
+import json
+import threading
+
+import speech_recognition as sr
+
+from reading_aid.microphone import KEEP_SILENCE, PAUSE_THRESHOLD
+from reading_aid.recognition import LANGUAGE
+
+CHUNK_SECONDS = 2.0   # longest chunk, so partial results keep coming while the reader reads
+MIN_WAIT = 0.1        # shortest wait for the next chunk after one cut at CHUNK_SECONDS
+FAKE_WORDS_PER_CHUNK = 3
+
+
+class ChunkedStream:
+    """Recognizes each chunk with a one-shot backend as soon as it arrives."""
+
+    def __init__(self, backend, language=LANGUAGE, on_partial=None):
+        self.backend = backend
+        self.language = language
+        self.on_partial = on_partial
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="stream-chunk")
+        self._futures = []
+
+    def accept(self, audio):
+        future = self._executor.submit(self._recognize, audio)
+        self._futures.append(future)
+        if self.on_partial:
+            future.add_done_callback(lambda _: self.on_partial(self.partial()))
+
+    def _recognize(self, audio):
+        try:
+            return self.backend.recognize(audio, language=self.language)
+        except sr.UnknownValueError:
+            return ""  # a noisy chunk should not sink the whole reading
+
+    def partial(self):
+        """Transcript of the leading chunks that are already recognized."""
+        texts = []
+        for future in list(self._futures):
+            if not future.done() or future.exception() is not None:
+                break
+            texts.append(future.result())
+        return " ".join(t for t in texts if t)
+
+    def finish(self):
+        try:
+            texts = [future.result() for future in self._futures]  # re-raises sr.RequestError
+        finally:
+            self._executor.shutdown(wait=False)
+        return " ".join(t for t in texts if t)
+
+
+class VoskStream:
+    """Feeds chunks to one KaldiRecognizer, which decodes incrementally."""
+
+    def __init__(self, backend, language=LANGUAGE, on_partial=None):
+        self.on_partial = on_partial
+        self._rec = backend._vosk.KaldiRecognizer(backend.model, backend.SAMPLE_RATE)
+        self._sample_rate = backend.SAMPLE_RATE
+        # a single worker keeps the chunks in order on the non-thread-safe recognizer
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-vosk")
+        self._segments = []
+        self._current = ""
+        self._lock = threading.Lock()
+
+    def accept(self, audio):
+        self._executor.submit(self._feed, audio)
+
+    def _feed(self, audio):
+        pcm = bytes(audio.get_raw_data(convert_rate=self._sample_rate, convert_width=2))
+        if self._rec.AcceptWaveform(pcm):
+            text = json.loads(self._rec.Result()).get("text", "")
+            with self._lock:
+                self._segments.append(text)
+                self._current = ""
+        else:
+            with self._lock:
+                self._current = json.loads(self._rec.PartialResult()).get("partial", "")
+        if self.on_partial:
+            self.on_partial(self.partial())
+
+    def partial(self):
+        with self._lock:
+            return " ".join(t for t in self._segments + [self._current] if t)
+
+    def finish(self):
+        self._executor.shutdown(wait=True)
+        text = json.loads(self._rec.FinalResult()).get("text", "")
+        with self._lock:
+            self._segments.append(text)
+            self._current = ""
+        return self.partial()
+
+
+class FakeStream:
+    """Reveals the fake backend's next transcript a few words per chunk."""
+
+    def __init__(self, backend, language=LANGUAGE, on_partial=None):
+        self.backend = backend
+        self.language = language
+        self.on_partial = on_partial
+        self._words = None
+        self._shown = 0
+
+    def accept(self, audio):
+        if self._words is None:
+            try:
+                self._words = self.backend.recognize(audio, language=self.language).split()
+            except sr.UnknownValueError:
+                self._words = []
+        self._shown += FAKE_WORDS_PER_CHUNK
+        if self.on_partial:
+            self.on_partial(self.partial())
+
+    def partial(self):
+        return " ".join((self._words or [])[:self._shown])
+
+    def finish(self):
+        return " ".join(self._words or [])
+
+
+def open_stream(backend, language=LANGUAGE, on_partial=None):
+    """Incremental stream for `backend`, native if it has one."""
+    if hasattr(backend, "stream"):
+        return backend.stream(language=language, on_partial=on_partial)
+    return ChunkedStream(backend, language, on_partial)
+
+
+def listen_streaming(recognizer, source, stream, timeout=10, phrase_time_limit=15):
+    """Record chunk by chunk into `stream` until the reader stops; returns the whole recording.
+
+    Raises sr.WaitTimeoutError if no speech starts within `timeout` seconds,
+    like Recognizer.listen.
+    """
+    chunks = []
+    spoken = 0.0
+    wait = timeout
+    while spoken < phrase_time_limit:
+        limit = min(CHUNK_SECONDS, phrase_time_limit - spoken)
+        try:
+            chunk = recognizer.listen(source, timeout=wait, phrase_time_limit=limit)
+        except sr.WaitTimeoutError:
+            if not chunks:
+                raise
+            break
+        chunks.append(chunk)
+        stream.accept(chunk)
+        seconds = len(chunk.frame_data) / (chunk.sample_rate * chunk.sample_width)
+        spoken += seconds
+        # listen() keeps KEEP_SILENCE of the PAUSE_THRESHOLD that ended a
+        # phrase, so a chunk this short stopped on a pause: the reader is done
+        if seconds <= limit - (PAUSE_THRESHOLD - KEEP_SILENCE):
+            break
+        # Cut at the limit: wait out what is left of the pause threshold
+        wait = max(PAUSE_THRESHOLD - trailing_silence(chunk, recognizer.energy_threshold), MIN_WAIT)
+    first = chunks[0]
+    return sr.AudioData(b"".join(c.frame_data for c in chunks), first.sample_rate, first.sample_width)
+
+
+def trailing_silence(chunk, energy_threshold):
+    """Seconds at the end of `chunk` below listen()'s speech threshold"""
+    from reading_aid.preprocess import FRAME_SECONDS, frame_rms, pcm_view
+
+    energy = frame_rms(pcm_view(chunk.frame_data, chunk.sample_width), chunk.sample_rate)
+    loud = (energy * 2 ** (8 * chunk.sample_width - 1) > energy_threshold).nonzero()[0]
+    silent = len(energy) - (loud[-1] + 1 if len(loud) else 0)
+    return silent * FRAME_SECONDS
+
+
+def finish_stream(stream):
+    """Final transcript; raises sr.UnknownValueError if nothing was understood."""
+    text = stream.finish().strip()
+    if not text:
+        raise sr.UnknownValueError()
+    return text
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+The app's stylesheet as a static, content-hashed asset.
+
+Streamlit serves the folder ``static/`` next to the main script under
+``app/static/`` when server.enableStaticServing is on (.streamlit/config.toml).
+publish() copies reading_aid/assets/theme.css there as theme.<hash>.css, so
+the URL changes whenever the stylesheet does and the browser can keep its
+copy as long as it likes. Every rerun then only carries a one-line @import
+instead of the whole stylesheet.
+
+Fonts: when every file named in assets/fonts.css is in static/fonts, its
+@font-face rules lead the stylesheet and the fonts are served the same
+way, offline included. Until then, and for the inline fallback (whose
+relative URLs would not resolve), the font stacks fall back to system
+fonts; nothing is loaded from another site.
+"""
+
+import glob
+import hashlib
+import os
+import re
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+THEME_PATH = os.path.join(ASSETS_DIR, "theme.css")
+FONTS_PATH = os.path.join(ASSETS_DIR, "fonts.css")
+URL_PREFIX = "app/static"
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def font_rules(static_dir=None, fonts=FONTS_PATH):
+    """The bundled @font-face rules if static_dir/fonts has every file they name, else nothing"""
+    if static_dir is None:
+        return ""
+    with open(fonts, encoding="utf-8") as f:
+        rules = f.read()
+    files = re.findall(r"url\('fonts/([^']+)'\)", rules)
+    if all(os.path.exists(os.path.join(static_dir, "fonts", name)) for name in files):
+        return rules
+    return ""
+
+
+def publish(static_dir, source=THEME_PATH):
+    """Write the hashed copy of the stylesheet into static_dir; returns its URL"""
+    with open(source, encoding="utf-8") as f:
+        data = (font_rules(static_dir) + f.read()).encode("utf-8")
+    name = f"theme.{content_hash(data)}.css"
+    target = os.path.join(static_dir, name)
+    if not os.path.exists(target):
+        os.makedirs(static_dir, exist_ok=True)
+        for stale in glob.glob(os.path.join(static_dir, "theme.*.css")):
+            os.remove(stale)
+        tmp = target + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+    return f"{URL_PREFIX}/{name}"
+
+
+def stylesheet_tag(url):
+    """The per-rerun HTML: a style element that pulls in the cached stylesheet"""
+    return f'<style>@import url("{url}");</style>'
+
+
+def inline_tag(source=THEME_PATH):
+    """The whole stylesheet inline; for servers without static file serving"""
+    with open(source, encoding="utf-8") as f:
+        return f"<style>{font_rules()}{f.read()}</style>"
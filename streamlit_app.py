@@ -1,14 +1,22 @@
 import streamlit as st
-import random
-import speech_recognition as sr
-from fuzzywuzzy import fuzz
-import statistics
+import os
 import time
+import uuid
+from streamlit.errors import StreamlitAPIException
+
+# Only light modules here: recognition and scoring are loaded by warm_up()
+# on a pool thread, so the first page does not wait for them
+from reading_aid import metrics, theme
+from reading_aid.corpus import get_corpus
+from reading_aid.jobs import ReadingJob, get_executor, record_and_score, score_upload, stream_and_score
+from reading_aid.store import get_store
 
 # ------------------------------------------------------------
 # Streamlit UI Setup - ENHANCED VERSION
 # ------------------------------------------------------------
 
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
 st.set_page_config(
     page_title="Dyslexia Reading Aid",
     page_icon="📖",
@@ -16,396 +24,119 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Enhanced CSS with modern design, animations, and accessibility
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+Devanagari:wght@400;600;700&family=Inter:wght@300;400;500;600;700&display=swap');
-
-    /* Root Variables for consistent theming */
-    :root {
-        --primary-bg: #f8f9fa;
-        --card-bg: #ffffff;
-        --accent-color: #4f46e5;
-        --accent-hover: #3730a3;
-        --text-primary: #1f2937;
-        --text-secondary: #6b7280;
-        --success-color: #059669;
-        --warning-color: #d97706;
-        --error-color: #dc2626;
-        --border-radius: 16px;
-        --shadow-sm: 0 1px 3px rgba(0,0,0,0.1);
-        --shadow-md: 0 4px 12px rgba(0,0,0,0.1);
-        --shadow-lg: 0 10px 25px rgba(0,0,0,0.15);
-        --transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-    }
-
-    /* General Body Styles */
-    html, body, [class*="css"] {
-        font-family: 'Inter', 'Noto Sans Devanagari', sans-serif;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        min-height: 100vh;
-        color: var(--text-primary);
-    }
-    
-    /* Main App Container */
-    .stApp {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        min-height: 100vh;
-    }
-
-    /* Main Content Area */
-    .main .block-container {
-        padding: 3rem 1rem 2rem 1rem;
-        max-width: 800px;
-    }
-
-    /* Enhanced Card Design */
-    .modern-card {
-        background: var(--card-bg);
-        border-radius: var(--border-radius);
-        padding: 2.5rem;
-        margin: 1.5rem 0;
-        box-shadow: var(--shadow-lg);
-        border: 1px solid rgba(255,255,255,0.2);
-        backdrop-filter: blur(10px);
-        transition: var(--transition);
-        position: relative;
-        overflow: hidden;
-    }
-
-    .modern-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 4px;
-        background: linear-gradient(90deg, var(--accent-color), #7c3aed);
-        border-radius: var(--border-radius) var(--border-radius) 0 0;
-    }
-
-    .modern-card:hover {
-        transform: translateY(-4px);
-        box-shadow: var(--shadow-lg);
-    }
-
-    /* Typography */
-    h1 {
-        font-family: 'Inter', sans-serif;
-        color: #ffffff;
-        font-weight: 700;
-        font-size: 3rem;
-        text-align: center;
-        margin-bottom: 1rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        background: linear-gradient(135deg, #ffffff 0%, #f0f0f0 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-
-    h2, h3 {
-        font-family: 'Inter', sans-serif;
-        color: var(--text-primary);
-        font-weight: 600;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-
-    h2 {
-        font-size: 2rem;
-        color: #ffffff;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
-    }
-
-    /* Enhanced Sentence Box */
-    .sentence-display {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: var(--border-radius);
-        padding: 2rem;
-        font-size: 1.8rem;
-        font-weight: 600;
-        color: #ffffff;
-        text-align: center;
-        margin: 2rem 0;
-        border: 3px solid rgba(255,255,255,0.2);
-        box-shadow: var(--shadow-md);
-        position: relative;
-        line-height: 1.6;
-        font-family: 'Noto Sans Devanagari', sans-serif;
-    }
-
-    .sentence-display::before {
-        content: '"';
-        position: absolute;
-        top: -10px;
-        left: 20px;
-        font-size: 4rem;
-        color: rgba(255,255,255,0.3);
-        font-family: serif;
-    }
-
-    .sentence-display::after {
-        content: '"';
-        position: absolute;
-        bottom: -30px;
-        right: 20px;
-        font-size: 4rem;
-        color: rgba(255,255,255,0.3);
-        font-family: serif;
-    }
-
-    /* Enhanced Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, var(--accent-color) 0%, #7c3aed 100%);
-        color: white;
-        border: none;
-        border-radius: 50px;
-        padding: 1rem 2.5rem;
-        font-size: 1.1rem;
-        font-weight: 600;
-        font-family: 'Inter', sans-serif;
-        cursor: pointer;
-        transition: var(--transition);
-        box-shadow: var(--shadow-md);
-        position: relative;
-        overflow: hidden;
-        min-width: 200px;
-        text-transform: none;
-        letter-spacing: 0.5px;
-    }
-
-    .stButton > button::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.2), transparent);
-        transition: left 0.6s;
-    }
-
-    .stButton > button:hover::before {
-        left: 100%;
-    }
-
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 25px rgba(79, 70, 229, 0.4);
-        background: linear-gradient(135deg, var(--accent-hover) 0%, #6d28d9 100%);
-    }
-
-    .stButton > button:active {
-        transform: translateY(0);
-    }
-
-    /* Progress Indicators */
-    .progress-container {
-        background: rgba(255,255,255,0.1);
-        border-radius: 50px;
-        padding: 8px;
-        margin: 1rem 0;
-        backdrop-filter: blur(10px);
-    }
-
-    .progress-bar {
-        background: linear-gradient(90deg, var(--success-color), #10b981);
-        height: 12px;
-        border-radius: 50px;
-        transition: width 0.8s ease;
-        box-shadow: 0 2px 8px rgba(5, 150, 105, 0.3);
-    }
-
-    /* Status Messages */
-    .status-success {
-        background: linear-gradient(135deg, var(--success-color), #10b981);
-        color: white;
-        padding: 1.5rem;
-        border-radius: var(--border-radius);
-        margin: 1rem 0;
-        box-shadow: var(--shadow-md);
-        border-left: 4px solid #059669;
-        animation: slideIn 0.5s ease-out;
-    }
-
-    .status-warning {
-        background: linear-gradient(135deg, var(--warning-color), #f59e0b);
-        color: white;
-        padding: 1.5rem;
-        border-radius: var(--border-radius);
-        margin: 1rem 0;
-        box-shadow: var(--shadow-md);
-        border-left: 4px solid #d97706;
-        animation: slideIn 0.5s ease-out;
-    }
-
-    .status-error {
-        background: linear-gradient(135deg, var(--error-color), #ef4444);
-        color: white;
-        padding: 1.5rem;
-        border-radius: var(--border-radius);
-        margin: 1rem 0;
-        box-shadow: var(--shadow-md);
-        border-left: 4px solid #dc2626;
-        animation: slideIn 0.5s ease-out;
-    }
-
-    /* Animations */
-    @keyframes slideIn {
-        from {
-            opacity: 0;
-            transform: translateY(20px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-
-    @keyframes fadeIn {
-        from { opacity: 0; }
-        to { opacity: 1; }
-    }
-
-    @keyframes pulse {
-        0%, 100% { transform: scale(1); }
-        50% { transform: scale(1.05); }
-    }
-
-    /* Loading Animation */
-    .loading-spinner {
-        border: 4px solid rgba(255,255,255,0.3);
-        border-top: 4px solid #ffffff;
-        border-radius: 50%;
-        width: 40px;
-        height: 40px;
-        animation: spin 1s linear infinite;
-        margin: 1rem auto;
-    }
-
-    @keyframes spin {
-        0% { transform: rotate(0deg); }
-        100% { transform: rotate(360deg); }
-    }
-
-    /* Metric Display */
-    .metric-container {
-        background: linear-gradient(135deg, rgba(255,255,255,0.9), rgba(255,255,255,0.7));
-        padding: 2rem;
-        border-radius: var(--border-radius);
-        text-align: center;
-        margin: 1.5rem 0;
-        box-shadow: var(--shadow-md);
-        backdrop-filter: blur(10px);
-    }
-
-    .metric-value {
-        font-size: 3rem;
-        font-weight: 700;
-        color: var(--accent-color);
-        margin: 0.5rem 0;
-    }
-
-    .metric-label {
-        font-size: 1.2rem;
-        color: var(--text-secondary);
-        font-weight: 500;
-    }
-
-    /* Responsive Design */
-    @media (max-width: 768px) {
-        .main .block-container {
-            padding: 2rem 1rem;
-        }
-        
-        .modern-card {
-            padding: 1.5rem;
-            margin: 1rem 0;
-        }
-        
-        .sentence-display {
-            font-size: 1.4rem;
-            padding: 1.5rem;
-        }
-        
-        h1 {
-            font-size: 2.5rem;
-        }
-        
-        .stButton > button {
-            min-width: 150px;
-            padding: 0.8rem 2rem;
-        }
-    }
-
-    /* Accessibility Improvements */
-    .stButton > button:focus {
-        outline: 3px solid rgba(79, 70, 229, 0.5);
-        outline-offset: 2px;
-    }
-
-    /* Custom Streamlit Component Overrides */
-    .stAlert {
-        border-radius: var(--border-radius);
-        border: none;
-        box-shadow: var(--shadow-md);
-    }
-
-    .stProgress > div > div {
-        background: linear-gradient(90deg, var(--accent-color), #7c3aed);
-        border-radius: 50px;
-    }
-
-    /* Hide Streamlit Branding */
-    .stDeployButton {
-        display: none;
-    }
-    
-    footer {
-        display: none;
-    }
-    
-    .stApp > header {
-        display: none;
-    }
-
-    </style>
-    """, unsafe_allow_html=True)
 
 # ------------------------------------------------------------
-# Hindi sentences
+# Shared resources: built once per server process, not on every rerun
 # ------------------------------------------------------------
-sentences = [
-    "भारत एक विशाल देश है और इसकी संस्कृति विविधता से भरपूर है।",
-    "गंगा नदी भारत की सबसे पवित्र नदियों में से एक मानी जाती है।",
-    "ताजमहल प्रेम का अद्भुत प्रतीक है।",
-    "हिमालय पर्वत श्रृंखला प्राकृतिक सौंदर्य का खजाना है।",
-    "दिल्ली भारत की राजधानी और ऐतिहासिक धरोहरों का केंद्र है।",
-    "सत्य और अहिंसा महात्मा गांधी के मुख्य सिद्धांत थे।",
-    "भारत में विभिन्न भाषाएँ और परंपराएँ एकता में बंधी हैं।",
-    "कड़ी मेहनत और दृढ़ निश्चय सफलता की कुंजी हैं।",
-    "पेड़ हमें स्वच्छ हवा और छाया प्रदान करते हैं।",
-    "पुस्तकें ज्ञान का सबसे बड़ा स्रोत होती हैं।"
-]
+@st.cache_resource(show_spinner=False)
+def load_backend():
+    from reading_aid.recognition import get_backend
+    return get_backend()
+
+@st.cache_resource(show_spinner=False)
+def load_corpus():
+    """The Hindi sentences (READING_AID_CORPUS or the built-in set) and their scoring index"""
+    from reading_aid.scoring import get_index
+    corpus = get_corpus()
+    return corpus, get_index(corpus)
+
+@st.cache_resource(show_spinner=False)
+def load_item_bank():
+    """Sentence difficulties for adaptive tests (READING_AID_DIFFICULTY, or uncalibrated)"""
+    from reading_aid.adaptive import get_item_bank
+    return get_item_bank()
+
+@st.cache_resource(show_spinner=False)
+def load_theme():
+    """Enhanced CSS with modern design, animations, and accessibility"""
+    if st.get_option("server.enableStaticServing"):
+        return theme.stylesheet_tag(theme.publish(STATIC_DIR))
+    return theme.inline_tag()
+
+@st.cache_resource(show_spinner=False)
+def start_metrics():
+    """Attempt log lines (stderr unless READING_AID_ATTEMPT_LOG says otherwise) and /metrics"""
+    metrics.configure_log(os.environ.get("READING_AID_ATTEMPT_LOG", "-"))
+    return metrics.serve_from_env()
+
+def _load_engine():
+    from reading_aid import engine, ingest  # noqa: F401 - what the first upload job imports
+    from reading_aid.alignment import evaluate
+    _, corpus_index = load_corpus()
+    load_backend()
+    sample = corpus_index.entry(0).text
+    corpus_index.score(sample, sample)
+    evaluate(sample, sample)
+
+@st.cache_resource(show_spinner=False)
+def warm_up():
+    """Startup hook: load the engine and run the scoring path once, in the background
+
+    The home page renders meanwhile; a reader reaches the first sentence
+    after it has finished. Callers that need the engine get it from the
+    same cached loaders and wait only if it is still loading.
+    """
+    return get_executor().submit(_load_engine)
+
+warm_up()
+start_metrics()
+results = get_store()  # None with READING_AID_RESULTS=0
+st.html(load_theme())
+
 LINES_PER_TEST = 3
-recognizer = sr.Recognizer()
+POLL_SECONDS = 0.25  # longest a script run waits on a pending recording job
+# "browser": readers record on their own device; "server": the server's microphone
+CAPTURE_MODE = os.environ.get("READING_AID_CAPTURE", "browser")
+# Server capture only: transcribe and score while the reader is still speaking
+STREAMING = os.environ.get("READING_AID_STREAMING") == "1"
+# Pick each next sentence from the reader's scores so far (reading_aid/adaptive.py)
+ADAPTIVE = os.environ.get("READING_AID_ADAPTIVE") == "1"
 
 # Initialize session state variables
 if 'page' not in st.session_state:
     st.session_state.page = "home"
 if 'all_scores' not in st.session_state:
     st.session_state.all_scores = []
+if 'fluency' not in st.session_state:
+    st.session_state.fluency = []
 if 'chosen_lines' not in st.session_state:
     st.session_state.chosen_lines = []
 if 'current_sentence_idx' not in st.session_state:
     st.session_state.current_sentence_idx = 0
+if 'adaptive' not in st.session_state:
+    st.session_state.adaptive = None  # AdaptiveTest of the current test, with READING_AID_ADAPTIVE=1
+if 'job' not in st.session_state:
+    st.session_state.job = None
+if 'last_result' not in st.session_state:
+    st.session_state.last_result = None
+if 'attempt' not in st.session_state:
+    st.session_state.attempt = 0
+if 'noise_floor' not in st.session_state:
+    st.session_state.noise_floor = None  # server capture: calibrated once per session
+if 'test_session' not in st.session_state:
+    st.session_state.test_session = None  # id of the current test in the results store
+if 'school' not in st.session_state:
+    # One deployment per school (READING_AID_SCHOOL), or a shared one with ?school=... links
+    st.session_state.school = st.query_params.get("school") or os.environ.get("READING_AID_SCHOOL")
+if 'rendering' not in st.session_state:
+    st.session_state.rendering = None  # (attempt, collected at) until its result is on screen
 
 # --- Functions ---
 def start_test():
-    st.session_state.chosen_lines = random.sample(sentences, k=LINES_PER_TEST)
+    sentences, _ = load_corpus()
+    if ADAPTIVE:
+        from reading_aid.adaptive import AdaptiveTest
+        test = AdaptiveTest(load_item_bank())
+        st.session_state.adaptive = test
+        st.session_state.chosen_lines = [sentences[test.next_item()]]  # the rest follow the scores
+    else:
+        st.session_state.chosen_lines = sentences.sample(LINES_PER_TEST)
     st.session_state.current_sentence_idx = 0
     st.session_state.all_scores = []
+    st.session_state.fluency = []
+    st.session_state.job = None
+    st.session_state.last_result = None
+    st.session_state.test_session = uuid.uuid4().hex
     st.session_state.page = "test"
 
 def restart_test():
@@ -425,6 +156,201 @@ def create_progress_indicator(current, total):
     </p>
     """, unsafe_allow_html=True)
 
+JOB_STATUS_TEXT = {
+    "queued": "⏳ कृपया प्रतीक्षा करें...",
+    "recording": "🎤 रिकॉर्डिंग हो रही है... अब बोलें!",
+    "analysing": "⚙️ विश्लेषण हो रहा है... कृपया प्रतीक्षा करें...",
+}
+
+# metrics.outcome_of() label -> card
+ERROR_CARDS = {
+    "timeout": """
+    <div class="status-warning">
+        <h4>⏰ समय समाप्त</h4>
+        <p>कृपया फिर से प्रयास करें और तुरंत बोलना शुरू करें।</p>
+    </div>
+    """,
+    "unintelligible": """
+    <div class="status-error">
+        <h4>🔊 आवाज़ स्पष्ट नहीं</h4>
+        <p>कृपया साफ़ और स्पष्ट आवाज़ में बोलने का प्रयास करें।</p>
+    </div>
+    """,
+    "request_error": """
+    <div class="status-error">
+        <h4>🌐 कनेक्शन समस्या</h4>
+        <p>इंटरनेट कनेक्शन जांचें और पुनः प्रयास करें।</p>
+    </div>
+    """,
+    "decode_error": """
+    <div class="status-error">
+        <h4>🎙️ रिकॉर्डिंग पढ़ी नहीं जा सकी</h4>
+        <p>कृपया दोबारा रिकॉर्ड करें।</p>
+    </div>
+    """,
+}
+
+def submit_job(fn, *args):
+    """Hand a recording to the background pool; called from the recorder's callbacks"""
+    st.session_state.last_result = None
+    st.session_state.attempt += 1  # gives the next recorder widget a fresh key
+    if st.session_state.job is not None:
+        current = st.session_state.chosen_lines[st.session_state.current_sentence_idx]
+        save_attempt(st.session_state.job.attempt, current, outcome="superseded")
+    st.session_state.job = ReadingJob(fn, *args)
+    st.rerun(["result", "recorder"])  # the rest of the page is unchanged
+
+def save_attempt(attempt, hindi_text, result=None, outcome=None):
+    """Finish a reading attempt and queue it for the results store"""
+    attempt.finish(outcome)
+    if results is not None:
+        _, index = load_corpus()
+        results.add(attempt, hindi_text, result, index.entry(hindi_text).id,
+                    st.session_state.test_session, st.session_state.school)
+
+def show_result(placeholder, result, previous=False):
+    """Render the score card for one recognised reading"""
+    accuracy = result["accuracy"]
+    if accuracy >= 85:
+        result_class = "status-success"
+        icon = "✅"
+        message = "बहुत बढ़िया!"
+    elif accuracy >= 70:
+        result_class = "status-warning"
+        icon = "⚠️"
+        message = "अच्छा प्रयास!"
+    else:
+        result_class = "status-error"
+        icon = "❌"
+        message = "पुनः प्रयास करें"
+    if previous:
+        message = f"पिछला वाक्य: {message}"
+    missed_html = ""
+    if result["missed"]:
+        missed_html = f'<p style="margin: 0.5rem 0;"><strong>छूटे / गलत पढ़े शब्द:</strong> {", ".join(result["missed"])}</p>'
+
+    placeholder.markdown(f"""
+    <div class="{result_class}">
+        <h4 style="margin: 0 0 1rem 0;">{icon} {message}</h4>
+        <p style="margin: 0.5rem 0;"><strong>आपने कहा:</strong> "{result['transcript']}"</p>
+        <p style="margin: 0.5rem 0;"><strong>शब्द त्रुटि (WER):</strong> {result['wer']:.0%} | <strong>अक्षर त्रुटि (CER):</strong> {result['cer']:.0%}</p>
+        {missed_html}
+        <div class="metric-container" style="margin: 1rem 0; background: rgba(255,255,255,0.2);">
+            <div class="metric-value" style="color: white;">{accuracy}%</div>
+            <div class="metric-label" style="color: rgba(255,255,255,0.8);">शुद्धता स्कोर</div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+# --- Fragments: re-rendered on their own, without the rest of the page ---
+@st.fragment(key="result")
+def result_card(hindi_text):
+    """The result of the current recording: pending status, score or error"""
+    result_placeholder = st.empty()
+
+    # The previous sentence's result stays visible until the next recording starts
+    if st.session_state.last_result is not None:
+        show_result(result_placeholder, st.session_state.last_result, previous=True)
+
+    # Collect a finished job as soon as it is ready
+    job = st.session_state.job
+    if job is None:
+        return
+    if job.wait(timeout=POLL_SECONDS):
+        st.session_state.job = None
+        collected = time.perf_counter()
+        job.attempt.add("collect", collected - job.finished_at)
+        try:
+            result = job.result()
+        except Exception as e:
+            card = ERROR_CARDS.get(metrics.outcome_of(e))
+            if card is None:
+                raise
+            result_placeholder.markdown(card, unsafe_allow_html=True)
+            job.attempt.add("render", time.perf_counter() - collected)
+            save_attempt(job.attempt, hindi_text)
+        else:
+            st.session_state.all_scores.append(result["accuracy"])
+            st.session_state.fluency.append(result["fluency"])
+            st.session_state.last_result = result
+            st.session_state.rendering = (job.attempt, collected, hindi_text, result)
+            test = st.session_state.adaptive
+            if test is not None:
+                test.record(test.served[-1], result["accuracy"])
+                next_id = test.next_item()  # None once the screening is decided
+                if next_id is not None:
+                    st.session_state.chosen_lines.append(load_corpus()[0][next_id])
+            # Move to the next sentence as soon as the result is ready; the
+            # sentence and progress change, so this one is a full rerun
+            st.session_state.current_sentence_idx += 1
+            if st.session_state.current_sentence_idx >= len(st.session_state.chosen_lines):
+                st.session_state.page = "summary"
+            st.rerun()
+        return
+
+    # Still recording or analysing: show the current stage and poll again
+    partial_html = ""
+    if job.partial_transcript:
+        partial_html = f"""
+        <p style="color: white; margin-top: 0.5rem;">
+            🗣️ "{job.partial_transcript}" · {job.partial_score}%
+        </p>"""
+    result_placeholder.markdown(f"""
+    <div style="text-align: center; padding: 2rem;">
+        <div class="loading-spinner"></div>
+        <p style="color: white; margin-top: 1rem; font-size: 1.1rem;">
+            {JOB_STATUS_TEXT[job.status]}
+        </p>{partial_html}
+    </div>
+    """, unsafe_allow_html=True)
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()  # this was a full run (e.g. a page reload), which can only rerun in full
+
+@st.fragment(key="recorder")
+def recorder(idx, hindi_text):
+    """The recording widget for the current sentence"""
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        if CAPTURE_MODE == "server":
+            st.button("🎤 रिकॉर्डिंग शुरू करें", key=f"rec_{idx}",
+                      on_click=record_clicked, args=(hindi_text,))
+        else:
+            # Recorded in the browser; the server only receives the bytes
+            key = f"rec_{idx}_{st.session_state.attempt}"
+            st.audio_input(
+                "🎤 रिकॉर्डिंग शुरू करें",
+                key=key,
+                label_visibility="collapsed",
+                on_change=recording_uploaded,
+                args=(key, hindi_text),
+            )
+
+def record_clicked(hindi_text):
+    if st.session_state.job is not None:
+        st.rerun("result")  # already recording from the server microphone
+    if st.session_state.noise_floor is None:
+        from reading_aid.microphone import NoiseFloor
+        st.session_state.noise_floor = NoiseFloor()
+    record = stream_and_score if STREAMING else record_and_score
+    _, index = load_corpus()
+    submit_job(record, load_backend(), index, hindi_text, st.session_state.noise_floor)
+
+def recording_uploaded(key, hindi_text):
+    recording = st.session_state[key]
+    if recording is None:
+        st.rerun("recorder")
+    # A new recording replaces one still being analysed
+    _, index = load_corpus()
+    submit_job(score_upload, load_backend(), index, hindi_text, recording.getbuffer())
+
+# Operator details live in the sidebar, which starts collapsed; once the engine is loaded
+if warm_up().done() and hasattr(load_backend(), "cache"):
+    with st.sidebar:
+        st.caption("🗃️ पहचान कैश (recognition cache)")
+        st.json(load_backend().cache.stats(), expanded=False)
+
 # --- Main App Logic using Pages ---
 
 # PAGE 1: HOME SCREEN
@@ -448,19 +374,19 @@ if st.session_state.page == "home":
     
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        if st.button("🚀 परीक्षण शुरू करें"):
-            start_test()
-            st.rerun()
+        # Callbacks run before the click's own rerun, so no second st.rerun() is needed
+        st.button("🚀 परीक्षण शुरू करें", on_click=start_test)
 
 # PAGE 2: TEST SCREEN
 elif st.session_state.page == "test":
     idx = st.session_state.current_sentence_idx
     
-    if idx < LINES_PER_TEST:
+    if idx < len(st.session_state.chosen_lines):
         hindi_text = st.session_state.chosen_lines[idx]
 
-        # Progress indicator
-        create_progress_indicator(idx + 1, LINES_PER_TEST)
+        # Progress indicator; an adaptive test may finish before its maximum
+        test = st.session_state.adaptive
+        create_progress_indicator(idx + 1, test.max_items if test is not None else LINES_PER_TEST)
         
         st.markdown(f"<h2>पंक्ति {idx + 1}</h2>", unsafe_allow_html=True)
         
@@ -477,9 +403,6 @@ elif st.session_state.page == "test":
         </div>
         """, unsafe_allow_html=True)
 
-        # Use a placeholder for messages and results
-        result_placeholder = st.empty()
-
         # Recording instructions
         st.markdown("""
         <div class="modern-card" style="text-align: center;">
@@ -489,91 +412,9 @@ elif st.session_state.page == "test":
         </div>
         """, unsafe_allow_html=True)
 
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            if st.button("🎤 रिकॉर्डिंग शुरू करें", key=f"rec_{idx}"):
-                # Show loading animation
-                result_placeholder.markdown("""
-                <div style="text-align: center; padding: 2rem;">
-                    <div class="loading-spinner"></div>
-                    <p style="color: white; margin-top: 1rem; font-size: 1.1rem;">
-                        🎤 रिकॉर्डिंग हो रही है... अब बोलें!
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                try:
-                    with sr.Microphone() as source:
-                        recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                        audio = recognizer.listen(source, timeout=10, phrase_time_limit=15)
-                    
-                    result_placeholder.markdown("""
-                    <div style="text-align: center; padding: 2rem;">
-                        <div class="loading-spinner"></div>
-                        <p style="color: white; margin-top: 1rem; font-size: 1.1rem;">
-                            ⚙️ विश्लेषण हो रहा है... कृपया प्रतीक्षा करें...
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Speech to text
-                    user_speech = recognizer.recognize_google(audio, language="hi-IN")
-                    
-                    # Calculate accuracy
-                    accuracy = fuzz.token_sort_ratio(hindi_text, user_speech)
-                    st.session_state.all_scores.append(accuracy)
-
-                    # Enhanced result display
-                    if accuracy >= 85:
-                        result_class = "status-success"
-                        icon = "✅"
-                        message = "बहुत बढ़िया!"
-                    elif accuracy >= 70:
-                        result_class = "status-warning"
-                        icon = "⚠️"
-                        message = "अच्छा प्रयास!"
-                    else:
-                        result_class = "status-error"
-                        icon = "❌"
-                        message = "पुनः प्रयास करें"
-
-                    result_placeholder.markdown(f"""
-                    <div class="{result_class}">
-                        <h4 style="margin: 0 0 1rem 0;">{icon} {message}</h4>
-                        <p style="margin: 0.5rem 0;"><strong>आपने कहा:</strong> "{user_speech}"</p>
-                        <div class="metric-container" style="margin: 1rem 0; background: rgba(255,255,255,0.2);">
-                            <div class="metric-value" style="color: white;">{accuracy}%</div>
-                            <div class="metric-label" style="color: rgba(255,255,255,0.8);">शुद्धता स्कोर</div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                    # Move to the next sentence after a short delay
-                    st.session_state.current_sentence_idx += 1
-                    time.sleep(3)
-                    st.rerun()
-
-                except sr.WaitTimeoutError:
-                    result_placeholder.markdown("""
-                    <div class="status-warning">
-                        <h4>⏰ समय समाप्त</h4>
-                        <p>कृपया फिर से प्रयास करें और तुरंत बोलना शुरू करें।</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                except sr.UnknownValueError:
-                    result_placeholder.markdown("""
-                    <div class="status-error">
-                        <h4>🔊 आवाज़ स्पष्ट नहीं</h4>
-                        <p>कृपया साफ़ और स्पष्ट आवाज़ में बोलने का प्रयास करें।</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                except sr.RequestError:
-                    result_placeholder.markdown("""
-                    <div class="status-error">
-                        <h4>🌐 कनेक्शन समस्या</h4>
-                        <p>इंटरनेट कनेक्शन जांचें और पुनः प्रयास करें।</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+        # Only these two re-render while a sentence is being read
+        result_card(hindi_text)
+        recorder(idx, hindi_text)
 
     else:
         st.session_state.page = "summary"
@@ -584,20 +425,52 @@ elif st.session_state.page == "summary":
     st.title("📊 परीक्षण सारांश")
     
     if st.session_state.all_scores:
-        avg_score = round(statistics.mean(st.session_state.all_scores), 1)
+        test = st.session_state.adaptive
+        if test is not None:
+            # The sentences were picked to suit the reader, so their plain average
+            # says little; use the expected accuracy on a typical sentence instead
+            avg_score = round(test.expected_accuracy(), 1)
+            score_label = "अनुमानित शुद्धता स्कोर"
+        else:
+            avg_score = round(sum(st.session_state.all_scores) / len(st.session_state.all_scores), 1)
+            score_label = "औसत शुद्धता स्कोर"
         
         # Enhanced metric display
         st.markdown(f"""
         <div class="modern-card">
             <div class="metric-container">
                 <div class="metric-value">{avg_score}%</div>
-                <div class="metric-label">औसत शुद्धता स्कोर</div>
+                <div class="metric-label">{score_label}</div>
             </div>
         </div>
         """, unsafe_allow_html=True)
         
         # Visual progress bar
         st.progress(int(avg_score))
+
+        # Reading speed and hesitation, from the recordings' energy envelope
+        from reading_aid import fluency
+        fluency_summary = fluency.summarize(st.session_state.fluency)
+        if fluency_summary:
+            st.markdown(f"""
+            <div class="modern-card">
+                <h4 style="color: var(--accent-color); text-align: center;">पढ़ने की गति और प्रवाह</h4>
+                <div style="display: flex; justify-content: space-around; text-align: center;">
+                    <div>
+                        <div class="metric-value" style="font-size: 2rem;">{fluency_summary['words_per_minute']}</div>
+                        <div class="metric-label">शब्द प्रति मिनट</div>
+                    </div>
+                    <div>
+                        <div class="metric-value" style="font-size: 2rem;">{fluency_summary['pauses']}</div>
+                        <div class="metric-label">विराम ({fluency_summary['pause_seconds']} सेकंड)</div>
+                    </div>
+                    <div>
+                        <div class="metric-value" style="font-size: 2rem;">{fluency_summary['hesitations']}</div>
+                        <div class="metric-label">लंबी झिझक</div>
+                    </div>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
         
         # Enhanced result interpretation
         if avg_score < 70:
@@ -658,9 +531,7 @@ elif st.session_state.page == "summary":
     # Action buttons
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        if st.button("🔄 पुनः परीक्षण करें"):
-            restart_test()
-            st.rerun()
+        st.button("🔄 पुनः परीक्षण करें", on_click=restart_test)
 
     # Additional information
     st.markdown("""
@@ -672,4 +543,11 @@ elif st.session_state.page == "summary":
             यह परीक्षण चिकित्सा निदान का विकल्प नहीं है।
         </p>
     </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """, unsafe_allow_html=True)
+
+# The attempt whose result this run showed is complete once the script gets here
+if st.session_state.rendering is not None:
+    attempt, collected, hindi_text, result = st.session_state.rendering
+    attempt.add("render", time.perf_counter() - collected)
+    save_attempt(attempt, hindi_text, result)
+    st.session_state.rendering = None
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""SentenceIndex.score and score_matrix must return exactly fuzz.token_sort_ratio."""
+
+import pytest
+from fuzzywuzzy import fuzz
+
+from reading_aid.corpus import SENTENCES
+from reading_aid.scoring import SentenceIndex, score_matrix
+
+TRANSCRIPTS = [
+    None,
+    "",
+    "   ",
+    "hello world",
+    "Hello, World!",
+    "ताजमहल प्रेम का प्रतीक है",
+    "गंगा नदी भारत की पवित्र नदी है।",
+    "\u095b\u092e\u0940\u0928 \u092a\u0930 \u095e\u0942\u0932",  # nukta, precomposed (ज़मीन पर फ़ूल)
+    "\u091c\u093c\u092e\u0940\u0928 \u092a\u0930 \u092b\u093c\u0942\u0932",  # nukta, decomposed
+    "भारत, एक देश!! है?",
+    "दिल्ली 2024 delhi",
+    "।।",
+] + SENTENCES + [sentence[: len(sentence) // 2] for sentence in SENTENCES]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SentenceIndex(SENTENCES)
+
+
+@pytest.mark.parametrize("transcript", TRANSCRIPTS)
+def test_score_matches_token_sort_ratio(index, transcript):
+    for reference in SENTENCES:
+        assert index.score(reference, transcript) == fuzz.token_sort_ratio(reference, transcript)
+
+
+def test_score_matrix_matches_token_sort_ratio(index):
+    expected = [[fuzz.token_sort_ratio(reference, transcript) for reference in SENTENCES]
+                for transcript in TRANSCRIPTS]
+    assert score_matrix(TRANSCRIPTS, SENTENCES).tolist() == expected
+    assert index.score_matrix(TRANSCRIPTS).tolist() == expected